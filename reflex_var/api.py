@@ -0,0 +1,153 @@
+import asyncio
+import math
+
+import reflex as rx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+from starlette.routing import Route
+
+from .catalog import clutch_catalog
+from .circuit_breaker import grid_breaker
+from .events import suppressed_events
+from .grid_sync import grid_sync
+from .leaderboard import leaderboard_broadcaster, leaderboard_cache
+from .media_cache import media_cache
+from .metrics import render as render_metrics
+from .playback import first_frame_stats
+from .prefetch import clutch_prefetcher
+from .profiler import admin_authorized, sampling_profiler
+from .score_writer import score_writer
+from .scoring import ScoringRules, default_rules, score_checks
+from .share_qr import MEDIA_TYPES, SEGNO_AVAILABLE, share_qr_cache
+from .stills import still_index
+
+
+async def health(request: Request) -> JSONResponse:
+    """
+    Backend health for kiosk monitoring. Reports "degraded" (still HTTP 200,
+    the kiosk keeps serving local data) while the GRID circuit is not closed.
+    """
+    return JSONResponse({
+        "status": "degraded" if grid_breaker.is_open else "ok",
+        "grid_circuit": grid_breaker.stats(),
+        "prefetch": clutch_prefetcher.stats(),
+        "catalog": clutch_catalog.stats(),
+        "media_cache": media_cache.stats(),
+        "stills": still_index.stats(),
+        "first_frame": first_frame_stats.stats(),
+        "share_qr": share_qr_cache.stats(),
+        "grid_sync": grid_sync.stats(),
+        "score_writer": score_writer.stats(),
+        "score_checks": dict(score_checks),
+        "profiler": sampling_profiler.stats(),
+        "suppressed_events": dict(suppressed_events),
+    })
+
+
+async def metrics(request: Request) -> PlainTextResponse:
+    """Latency histograms in Prometheus text format, for scraping."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+async def leaderboard_rank(request: Request) -> JSONResponse:
+    """Rank a score against the stored leaderboard: /leaderboard/rank?accuracy=92.5"""
+    try:
+        accuracy = float(request.query_params["accuracy"])
+    except (KeyError, ValueError):
+        return JSONResponse({"error": "accuracy query parameter is required"}, status_code=400)
+    return JSONResponse({"accuracy": accuracy, "rank": await leaderboard_cache.rank_for(accuracy)})
+
+
+async def media(request: Request) -> Response:
+    """Cached clip video with HTTP Range support (seeking, partial loads)."""
+    response = media_cache.response(request.path_params["name"], request.headers.get("range"))
+    if response is None:
+        return JSONResponse({"error": "not cached"}, status_code=404)
+    return response
+
+
+async def still(request: Request) -> Response:
+    """Precomputed freeze-frame still; content-addressed, so cached as immutable."""
+    response = still_index.response(request.path_params["name"])
+    if response is None:
+        return JSONResponse({"error": "not found"}, status_code=404)
+    return response
+
+
+async def share_qr(request: Request) -> Response:
+    """Score share QR code rendered locally: /qr/share.svg?score=87.5&initials=C9J"""
+    kind = request.path_params["kind"]
+    if kind not in MEDIA_TYPES:
+        return JSONResponse({"error": "unsupported format"}, status_code=404)
+    try:
+        score = float(request.query_params.get("score", "0"))
+    except ValueError:
+        return JSONResponse({"error": "score must be a number"}, status_code=400)
+    if not SEGNO_AVAILABLE:
+        return JSONResponse({"error": "QR rendering unavailable (segno not installed)"}, status_code=503)
+    return await share_qr_cache.response(kind, score, request.query_params.get("initials", ""))
+
+
+async def profile(request: Request) -> Response:
+    """
+    Admin-only sampling profile of the live backend:
+    /admin/profile?seconds=10&interval_ms=5&format=collapsed|speedscope
+    """
+    if not admin_authorized(request.headers.get("authorization")):
+        return JSONResponse({"error": "unauthorized"}, status_code=401)
+    try:
+        seconds = float(request.query_params.get("seconds", "10"))
+        interval = float(request.query_params.get("interval_ms", "5")) / 1000
+    except ValueError:
+        return JSONResponse({"error": "seconds and interval_ms must be numbers"}, status_code=400)
+    if not all(math.isfinite(value) and value > 0 for value in (seconds, interval)):
+        return JSONResponse({"error": "seconds and interval_ms must be positive and finite"}, status_code=400)
+    fmt = request.query_params.get("format", "collapsed")
+    if fmt not in ("collapsed", "speedscope"):
+        return JSONResponse({"error": "format must be collapsed or speedscope"}, status_code=400)
+    if sampling_profiler.busy:
+        return JSONResponse({"error": "a profiling session is already running"}, status_code=409)
+    try:
+        # The sampler sleeps in its own thread, so the event loop keeps serving (and being sampled).
+        stacks, _ = await asyncio.to_thread(sampling_profiler.sample, seconds, interval)
+    except RuntimeError as e:
+        return JSONResponse({"error": str(e)}, status_code=409)
+    if fmt == "speedscope":
+        return JSONResponse(sampling_profiler.speedscope(stacks, interval))
+    return PlainTextResponse(sampling_profiler.collapsed(stacks))
+
+
+async def reload_scoring(request: Request) -> JSONResponse:
+    """
+    Admin-only: re-read the scoring rules from rxconfig and reload the
+    leaderboard from the database, then push it to every kiosk. Called by
+    `python -m reflex_var.scoring` once a re-score has finished.
+    """
+    if not admin_authorized(request.headers.get("authorization")):
+        return JSONResponse({"error": "unauthorized"}, status_code=401)
+    config = rx.config.get_config(reload=True)
+    try:
+        rules = ScoringRules.from_config(config)
+    except (TypeError, ValueError) as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    default_rules.replace(rules)
+    leaderboard_cache.invalidate()
+    leaderboard_broadcaster.request_rebuild()
+    return JSONResponse({
+        "scoring_default_slope": default_rules.client_slope(None),
+        "scoring_curves": sorted(default_rules.curves),
+    })
+
+
+# Extra backend routes, mounted in front of the Reflex backend via api_transformer.
+api = Starlette(routes=[
+    Route("/health", health),
+    Route("/metrics", metrics),
+    Route("/admin/profile", profile),
+    Route("/admin/scoring/reload", reload_scoring, methods=["POST"]),
+    Route("/leaderboard/rank", leaderboard_rank),
+    Route("/media/{name}", media),
+    Route("/stills/{name}", still),
+    Route("/qr/share.{kind}", share_qr),
+])
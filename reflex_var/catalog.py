@@ -0,0 +1,391 @@
+"""
+Preloaded clutch catalog.
+
+Clips live in a small SQLite file (clutch_catalog_path) that is read once at
+startup into compact __slots__ records with in-memory indexes. Build or reset
+the file from the built-in library with:
+
+    python -m reflex_var.catalog --seed
+"""
+
+import argparse
+import asyncio
+import bisect
+import contextlib
+import itertools
+import logging
+import operator
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+
+from .settings import Setting
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clip (
+    clip_id TEXT PRIMARY KEY,
+    player TEXT NOT NULL,
+    event TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    target_x REAL NOT NULL,
+    target_y REAL NOT NULL,
+    series_id TEXT NOT NULL,
+    match TEXT NOT NULL,
+    clip_duration REAL NOT NULL DEFAULT 6.0,
+    weight REAL NOT NULL DEFAULT 1.0,
+    source TEXT NOT NULL DEFAULT 'import'
+);
+CREATE INDEX IF NOT EXISTS ix_clip_series_id ON clip (series_id);
+CREATE INDEX IF NOT EXISTS ix_clip_player ON clip (player);
+CREATE INDEX IF NOT EXISTS ix_clip_event ON clip (event);
+CREATE INDEX IF NOT EXISTS ix_clip_match ON clip (match);
+"""
+
+COLUMNS = ("clip_id", "player", "event", "timestamp", "target_x", "target_y", "series_id", "match", "clip_duration", "weight", "source")
+
+_row = operator.attrgetter(*COLUMNS)
+
+# Seconds of replay before the VAR freeze when a clip has no duration metadata
+DEFAULT_CLIP_DURATION = 6.0
+
+# Where a clip came from: the built-in validated library, an offline dump
+# (importer.py) or the GRID sync (grid_sync.py). Only GRID clips count as live.
+SOURCE_LIBRARY = "library"
+SOURCE_IMPORT = "import"
+SOURCE_GRID = "grid"
+
+# Fields the catalog can filter on.
+INDEXED_FIELDS = ("series_id", "player", "event", "match")
+
+# Below this many candidates, exclusion is done exactly instead of by resampling.
+_EXACT_SELECTION_LIMIT = 1024
+
+
+def clip_key(series_id: str, event: str, timestamp: str) -> str:
+    """Catalog identity of a clip; two records with the same key are duplicates."""
+    return f"{series_id}|{event}|{timestamp}"
+
+
+class Clip:
+    """One catalog entry. __slots__ keeps 100k+ clips small in memory."""
+
+    __slots__ = COLUMNS
+
+    def __init__(self, clip_id, player, event, timestamp, target_x, target_y, series_id, match, clip_duration=DEFAULT_CLIP_DURATION, weight=1.0, source=SOURCE_IMPORT):
+        self.clip_id = clip_id
+        self.player = player
+        self.event = event
+        self.timestamp = timestamp
+        self.target_x = target_x
+        self.target_y = target_y
+        self.series_id = series_id
+        self.match = match
+        self.clip_duration = clip_duration
+        self.weight = weight
+        self.source = source
+
+    def to_dict(self) -> dict:
+        """Clutch record in the shape GameState.start_var_review expects."""
+        return {
+            "clip_id": self.clip_id,
+            "player": self.player,
+            "event": self.event,
+            "timestamp": self.timestamp,
+            "target_x": self.target_x,
+            "target_y": self.target_y,
+            "series_id": self.series_id,
+            "match": self.match,
+            "clip_duration": self.clip_duration,
+            "source": self.source,
+        }
+
+
+def library_clips() -> list[Clip]:
+    """The built-in validated library, used when no catalog file exists."""
+    from .grid_service import REAL_CLUTCH_LIBRARY
+
+    return [
+        Clip(
+            clip_id=clip_key(entry["series_id"], entry["event"], entry["timestamp"]),
+            player=entry["player"],
+            event=entry["event"],
+            timestamp=entry["timestamp"],
+            target_x=entry["target_x"],
+            target_y=entry["target_y"],
+            series_id=entry["series_id"],
+            match=entry["match"],
+            clip_duration=entry.get("clip_duration", DEFAULT_CLIP_DURATION),
+            source=SOURCE_LIBRARY,
+        )
+        for entry in REAL_CLUTCH_LIBRARY
+    ]
+
+
+def _select(connection: sqlite3.Connection) -> str:
+    """SELECT of every column; files from before a column existed get its default."""
+    present = {row[1] for row in connection.execute("PRAGMA table_info(clip)")}
+    return ", ".join(column if column in present else f"'{SOURCE_IMPORT}'" for column in COLUMNS)
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open the catalog file for writing, creating (or upgrading) the schema if needed."""
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    if "source" not in {row[1] for row in connection.execute("PRAGMA table_info(clip)")}:
+        with connection:
+            connection.execute(f"ALTER TABLE clip ADD COLUMN source TEXT NOT NULL DEFAULT '{SOURCE_IMPORT}'")
+    return connection
+
+
+def insert_clips(connection: sqlite3.Connection, clips, on_conflict: str = "REPLACE") -> int:
+    """
+    executemany the clips into an open catalog connection without committing.
+    on_conflict is REPLACE (upsert) or IGNORE (keep the first copy of a key).
+    Returns the number of rows written.
+    """
+    before = connection.total_changes
+    connection.executemany(
+        f"INSERT OR {on_conflict} INTO clip ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+        map(_row, clips),
+    )
+    return connection.total_changes - before
+
+
+def write_clips(path: str, clips, replace: bool = False) -> int:
+    """Upsert clips into the catalog file, creating it if needed."""
+    connection = connect(path)
+    try:
+        if replace:
+            connection.execute("DELETE FROM clip")
+        written = insert_clips(connection, clips)
+        connection.commit()
+        return written
+    finally:
+        connection.close()
+
+
+class ClutchCatalog:
+    """
+    Every clip held in memory with per-field indexes and cumulative weights,
+    so a pick is a binary search regardless of catalog size.
+
+    pick() is weighted by clip weight and, when given a kiosk session token,
+    avoids the last clutch_no_repeat_window clips served to that session.
+    """
+
+    path = Setting("clutch_catalog_path", "clutch_catalog.db", str)
+    no_repeat_window = Setting("clutch_no_repeat_window", 20, int)
+
+    def __init__(self, path: str | None = None, no_repeat_window: int | None = None, max_sessions: int = 1024):
+        self._path = path
+        self._no_repeat_window = no_repeat_window
+        self._max_sessions = max_sessions
+        self._load_lock = threading.Lock()
+        self._loaded = False
+        self.clips: list[Clip] = []
+        self._by_id: dict[str, int] = {}
+        self._indexes: dict[str, dict[str, list[int]]] = {}
+        # (field, value) -> (positions, cumulative weights); ("", "") is the whole catalog.
+        self._cumulative: dict[tuple[str, str], tuple[list[int], list[float]]] = {}
+        self._recent: OrderedDict[str, tuple[deque, set]] = OrderedDict()
+        self.source = ""
+        self.load_seconds = 0.0
+        self.picks = 0
+        self.resamples = 0
+
+    def load(self, force: bool = False):
+        """Read the catalog file (or the built-in library) and build the indexes."""
+        with self._load_lock:
+            if self._loaded and not force:
+                return
+            started = time.perf_counter()
+            clips, source = [], "library"
+            if os.path.exists(self.path):
+                try:
+                    connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+                    try:
+                        clips = [Clip(*row) for row in connection.execute(f"SELECT {_select(connection)} FROM clip ORDER BY rowid")]
+                        source = self.path
+                    finally:
+                        connection.close()
+                except sqlite3.Error as e:
+                    logger.warning("catalog %s unreadable, using the built-in library: %s", self.path, e)
+            if not clips:
+                clips, source = library_clips(), "library"
+
+            indexes: dict[str, dict[str, list[int]]] = {field: {} for field in INDEXED_FIELDS}
+            for position, clip in enumerate(clips):
+                for field in INDEXED_FIELDS:
+                    indexes[field].setdefault(getattr(clip, field), []).append(position)
+
+            self.clips = clips
+            self._by_id = {clip.clip_id: position for position, clip in enumerate(clips)}
+            self._indexes = indexes
+            self._cumulative = {}
+            self.source = source
+            self._loaded = True
+            self.load_seconds = time.perf_counter() - started
+
+    def add(self, clips) -> int:
+        """Append clips already written to the catalog file; returns how many were new."""
+        self.load()
+        added = 0
+        with self._load_lock:
+            for clip in clips:
+                if clip.clip_id in self._by_id:
+                    continue
+                position = len(self.clips)
+                self.clips.append(clip)
+                self._by_id[clip.clip_id] = position
+                for field in INDEXED_FIELDS:
+                    self._indexes[field].setdefault(getattr(clip, field), []).append(position)
+                added += 1
+            if added:
+                # Cumulative weights are rebuilt lazily on the next pick.
+                self._cumulative = {}
+        return added
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self):
+        """Load the catalog off the event loop before the first game starts."""
+        await asyncio.to_thread(self.load)
+        yield
+
+    def get(self, clip_id: str) -> Clip | None:
+        self.load()
+        position = self._by_id.get(clip_id)
+        return self.clips[position] if position is not None else None
+
+    def positions(self, field: str, value: str) -> list[int]:
+        """Positions of every clip whose `field` equals `value`."""
+        self.load()
+        return self._indexes[field].get(value, [])
+
+    def values(self, field: str) -> list[str]:
+        self.load()
+        return list(self._indexes[field])
+
+    def _pool(self, field: str, value: str) -> tuple[list[int], list[float]]:
+        key = (field, value)
+        pool = self._cumulative.get(key)
+        if pool is None:
+            positions = self.positions(field, value) if field else range(len(self.clips))
+            positions = list(positions)
+            cumulative = list(itertools.accumulate(max(self.clips[p].weight, 0.0) for p in positions))
+            pool = self._cumulative[key] = (positions, cumulative)
+        return pool
+
+    def _history(self, session: str) -> tuple[deque, set]:
+        history = self._recent.get(session)
+        if history is None:
+            history = self._recent[session] = (deque(), set())
+            if len(self._recent) > self._max_sessions:
+                self._recent.popitem(last=False)
+        else:
+            self._recent.move_to_end(session)
+        return history
+
+    def recently_served(self, session: str, clip_id: str) -> bool:
+        history = self._recent.get(session)
+        return history is not None and clip_id in history[1]
+
+    def mark_served(self, session: str, clip_id: str):
+        order, seen = self._history(session)
+        if clip_id in seen:
+            # Served again (small pool): it is now the most recent one.
+            order.remove(clip_id)
+            order.append(clip_id)
+            return
+        order.append(clip_id)
+        seen.add(clip_id)
+        while len(order) > self.no_repeat_window:
+            seen.discard(order.popleft())
+
+    def _exclusions(self, session: str | None, pool_size: int):
+        """
+        Clip ids pick() avoids for `session`. A pool no bigger than the window
+        would otherwise exclude everything; then only its most recent
+        pool_size - 1 clips are avoided, so the pool rotates.
+        """
+        history = self._recent.get(session) if session else None
+        if history is None:
+            return ()
+        order, seen = history
+        if len(seen) < pool_size:
+            return seen
+        return set(itertools.islice(reversed(order), pool_size - 1))
+
+    def pick(self, session: str | None = None, field: str = "", value: str = "") -> Clip | None:
+        """
+        Weighted random clip, optionally restricted to clips whose `field`
+        (one of INDEXED_FIELDS) equals `value`. Clips recently served to
+        `session` are skipped; a pool smaller than the window rotates through
+        its clips instead of repeating one.
+        """
+        self.load()
+        positions, cumulative = self._pool(field, value)
+        if not positions:
+            return None
+        total = cumulative[-1]
+        exclude = self._exclusions(session, len(positions))
+
+        clip = None
+        if total <= 0:
+            clip = self.clips[random.choice(positions)]
+        elif not exclude:
+            clip = self.clips[positions[bisect.bisect_right(cumulative, random.random() * total)]]
+        elif len(positions) <= _EXACT_SELECTION_LIMIT:
+            candidates = [self.clips[p] for p in positions if self.clips[p].clip_id not in exclude]
+            weights = [max(c.weight, 0.0) for c in candidates]
+            if candidates:
+                clip = random.choices(candidates, weights=weights)[0] if sum(weights) > 0 else random.choice(candidates)
+        else:
+            # Large pool, small exclusion set: a few resamples almost always suffice.
+            for _ in range(16):
+                clip = self.clips[positions[bisect.bisect_right(cumulative, random.random() * total)]]
+                if clip.clip_id not in exclude:
+                    break
+                self.resamples += 1
+
+        if clip is None:
+            clip = self.clips[positions[bisect.bisect_right(cumulative, random.random() * total)]]
+        self.picks += 1
+        if session:
+            self.mark_served(session, clip.clip_id)
+        return clip
+
+    def stats(self) -> dict:
+        return {
+            "clips": len(self.clips),
+            "source": self.source,
+            "load_seconds": self.load_seconds,
+            "picks": self.picks,
+            "resamples": self.resamples,
+            "sessions": len(self._recent),
+        }
+
+
+clutch_catalog = ClutchCatalog()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or inspect the clutch catalog file.")
+    parser.add_argument("--path", default=None, help="Catalog file (defaults to clutch_catalog_path)")
+    parser.add_argument("--seed", action="store_true", help="Replace the catalog contents with the built-in library")
+    args = parser.parse_args()
+
+    catalog = ClutchCatalog(path=args.path)
+    if args.seed:
+        written = write_clips(catalog.path, library_clips(), replace=True)
+        print(f"[CATALOG] wrote {written} clips to {catalog.path}")
+    catalog.load()
+    print(f"[CATALOG] {catalog.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import random
+import threading
+import time
+from enum import Enum
+
+from .settings import Setting
+
+
+class CircuitState(Enum):
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker for an upstream dependency.
+
+    After failure_threshold consecutive failures the circuit opens and callers
+    are told to skip the network entirely. Once a jittered cooldown elapses a
+    single probe request is let through (half-open); its outcome closes or
+    re-opens the circuit. Jitter keeps a fleet of kiosks from probing GRID in
+    lockstep.
+    """
+
+    failure_threshold = Setting("{self.name}_breaker_failure_threshold", 3, int)
+    cooldown = Setting("{self.name}_breaker_cooldown", 30)
+    jitter = Setting("{self.name}_breaker_jitter", 0.2)
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int | None = None,
+        cooldown: float | None = None,
+        jitter: float | None = None,
+    ):
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._cooldown = cooldown
+        self._jitter = jitter
+        self._lock = threading.Lock()
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_count = 0
+        self.rejected = 0
+        self._next_probe_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.state != CircuitState.CLOSED
+
+    def allow_request(self) -> bool:
+        """Return True if the caller may hit the network right now."""
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return True
+            if self.state == CircuitState.OPEN and time.monotonic() >= self._next_probe_at:
+                self.state = CircuitState.HALF_OPEN
+            if self.state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CircuitState.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def release(self):
+        """The request ended without an outcome (e.g. cancelled): free the probe slot, change nothing else."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != CircuitState.OPEN:
+                    self.opened_count += 1
+                self.state = CircuitState.OPEN
+                spread = random.uniform(1 - self.jitter, 1 + self.jitter)
+                self._next_probe_at = time.monotonic() + self.cooldown * spread
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state.value,
+            "failures": self.failures,
+            "opened_count": self.opened_count,
+            "rejected": self.rejected,
+            "retry_in": max(0.0, self._next_probe_at - time.monotonic()) if self.is_open else 0.0,
+        }
+
+
+# Breaker guarding every request to the GRID API.
+grid_breaker = CircuitBreaker("grid")
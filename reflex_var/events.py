@@ -0,0 +1,104 @@
+import functools
+import inspect
+import time
+from collections import Counter
+
+from .settings import setting
+
+# Duplicate invocations dropped by single_flight, per handler name.
+suppressed_events: Counter[str] = Counter()
+
+_running: set[tuple[str, str]] = set()
+_last_started: dict[tuple[str, str], float] = {}
+
+
+def _debounce_window() -> float:
+    return setting("event_debounce_window", 0.5, float)
+
+
+def _prune(window: float, now: float):
+    # Keep the start-time table bounded on a long-running kiosk backend.
+    if len(_last_started) > 10_000:
+        for key, started in list(_last_started.items()):
+            if now - started > window:
+                del _last_started[key]
+
+
+def single_flight(window: float | None = None):
+    """
+    Drop duplicate invocations of a GameState event handler for one session.
+
+    A call is suppressed while the same handler is still running for the same
+    client token, or if it started less than `window` seconds ago (Reflex runs
+    normal handlers one after another, so a double-fired on_click arrives just
+    after the first one finished). Apply it below @rx.event so background
+    handlers are wrapped as well.
+    """
+
+    def decorator(fn):
+        name = fn.__name__
+
+        def acquire(state) -> tuple[str, str] | None:
+            key = (state.router.session.client_token, name)
+            now = time.monotonic()
+            limit = _debounce_window() if window is None else window
+            if key in _running or now - _last_started.get(key, float("-inf")) < limit:
+                suppressed_events[name] += 1
+                return None
+            _prune(limit, now)
+            _running.add(key)
+            _last_started[key] = now
+            return key
+
+        if inspect.isasyncgenfunction(fn):
+
+            @functools.wraps(fn)
+            async def wrapper(self, *args, **kwargs):
+                key = acquire(self)
+                if key is None:
+                    return
+                try:
+                    async for update in fn(self, *args, **kwargs):
+                        yield update
+                finally:
+                    _running.discard(key)
+
+        elif inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def wrapper(self, *args, **kwargs):
+                key = acquire(self)
+                if key is None:
+                    return None
+                try:
+                    return await fn(self, *args, **kwargs)
+                finally:
+                    _running.discard(key)
+
+        elif inspect.isgeneratorfunction(fn):
+
+            @functools.wraps(fn)
+            def wrapper(self, *args, **kwargs):
+                key = acquire(self)
+                if key is None:
+                    return
+                try:
+                    yield from fn(self, *args, **kwargs)
+                finally:
+                    _running.discard(key)
+
+        else:
+
+            @functools.wraps(fn)
+            def wrapper(self, *args, **kwargs):
+                key = acquire(self)
+                if key is None:
+                    return None
+                try:
+                    return fn(self, *args, **kwargs)
+                finally:
+                    _running.discard(key)
+
+        return wrapper
+
+    return decorator
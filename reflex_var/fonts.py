@@ -0,0 +1,203 @@
+"""
+Self-hosted web fonts.
+
+The kiosk used to pull JetBrains Mono and Noto Sans from Google Fonts at
+runtime: a render-blocking cross-origin fetch on every cold boot, and no
+fonts at all offline. The vendoring job downloads the subsets we use once,
+stores them under assets/fonts/ with content-hashed names, and writes a
+stylesheet (font-display: swap) plus a manifest of the files worth preloading:
+
+    python -m reflex_var.fonts --subsets latin
+
+Commit the generated assets/fonts/ directory. Without it the app falls back
+to the Google Fonts stylesheet. Compare first contentful paint before and
+after (cold cache per run; needs Playwright, which the app does not):
+
+    python -m reflex_var.fonts --measure http://localhost:3000 --runs 10
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import statistics
+
+import httpx
+import reflex as rx
+
+GOOGLE_FONTS_URL = (
+    "https://fonts.googleapis.com/css2?family=JetBrains+Mono:wght@400;700;800"
+    "&family=Noto+Sans:wght@400;500;700&display=swap"
+)
+# Hosts of the fallback stylesheet and the font files it points at.
+GOOGLE_FONTS_ORIGINS = ("https://fonts.googleapis.com", "https://fonts.gstatic.com")
+
+FONTS_DIR = os.path.join("assets", "fonts")
+MANIFEST = os.path.join(FONTS_DIR, "manifest.json")
+
+# Google only serves woff2 to browsers it recognises.
+_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36"
+
+# One @font-face block per subset, preceded by a /* subset */ comment.
+_FACE = re.compile(r"/\*\s*([\w-]+)\s*\*/\s*@font-face\s*{([^}]*)}")
+_PROPERTY = re.compile(r"([\w-]+)\s*:\s*([^;]+);")
+_SRC_URL = re.compile(r"url\(([^)]+)\)")
+
+
+def _manifest() -> dict | None:
+    try:
+        with open(MANIFEST) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def stylesheets() -> list[str]:
+    """App stylesheets: the vendored font CSS when present, else Google Fonts."""
+    manifest = _manifest()
+    return [manifest["stylesheet"]] if manifest else [GOOGLE_FONTS_URL]
+
+
+def preload_links() -> list[rx.Component]:
+    """
+    <link rel=preload> for the faces the first screen renders with; without
+    vendored fonts, <link rel=preconnect> to Google Fonts so the handshakes
+    start before the stylesheet is parsed.
+    """
+    manifest = _manifest()
+    if manifest is None:
+        return [rx.el.link(rel="preconnect", href=origin, cross_origin="anonymous") for origin in GOOGLE_FONTS_ORIGINS]
+    return [
+        rx.el.link(rel="preload", href=href, type="font/woff2", cross_origin="anonymous", custom_attrs={"as": "font"})
+        for href in manifest.get("preload", [])
+    ]
+
+
+def _slug(family: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", family.lower()).strip("-")
+
+
+def vendor(
+    subsets: set[str],
+    preload_families: set[str],
+    css_url: str = GOOGLE_FONTS_URL,
+    transport: httpx.BaseTransport | None = None,
+) -> dict:
+    """Download the requested subsets into FONTS_DIR and write fonts.css and the manifest."""
+    os.makedirs(FONTS_DIR, exist_ok=True)
+    with httpx.Client(timeout=30.0, follow_redirects=True, headers={"User-Agent": _USER_AGENT}, transport=transport) as client:
+        response = client.get(css_url)
+        response.raise_for_status()
+
+        faces = []
+        files: dict[str, str] = {}  # remote URL -> local name (variable fonts share one file across weights)
+        preload: list[str] = []
+        for subset, body in _FACE.findall(response.text):
+            if subset not in subsets:
+                continue
+            props = {name: value.strip() for name, value in _PROPERTY.findall(body)}
+            remote = _SRC_URL.search(props.get("src", ""))
+            if remote is None:
+                continue
+            remote_url = remote.group(1).strip("'\"")
+            family = props.get("font-family", "").strip("'\"")
+            if remote_url not in files:
+                data = client.get(remote_url)
+                data.raise_for_status()
+                digest = hashlib.sha256(data.content).hexdigest()[:10]
+                name = f"{_slug(family)}-{props.get('font-weight', '400').replace(' ', '-')}-{subset}.{digest}.woff2"
+                with open(os.path.join(FONTS_DIR, name), "wb") as f:
+                    f.write(data.content)
+                files[remote_url] = name
+                if family in preload_families:
+                    preload.append(f"/fonts/{name}")
+            faces.append(
+                "@font-face {\n"
+                f"  font-family: '{family}';\n"
+                f"  font-style: {props.get('font-style', 'normal')};\n"
+                f"  font-weight: {props.get('font-weight', '400')};\n"
+                "  font-display: swap;\n"
+                f"  src: url(/fonts/{files[remote_url]}) format('woff2');\n"
+                + (f"  unicode-range: {props['unicode-range']};\n" if "unicode-range" in props else "")
+                + "}\n"
+            )
+
+    if not faces:
+        raise ValueError(f"no @font-face blocks for subsets {sorted(subsets)}")
+    with open(os.path.join(FONTS_DIR, "fonts.css"), "w") as f:
+        f.write(f"/* Generated by `python -m reflex_var.fonts` from {css_url} */\n")
+        f.writelines(faces)
+
+    # Files from a previous vendoring run that nothing references any more.
+    keep = set(files.values())
+    for entry in os.scandir(FONTS_DIR):
+        if entry.name.endswith(".woff2") and entry.name not in keep:
+            os.remove(entry.path)
+
+    manifest = {"stylesheet": "/fonts/fonts.css", "preload": preload, "files": sorted(keep), "source": css_url}
+    with open(MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def measure(url: str, runs: int) -> list[dict]:
+    """First contentful paint and font traffic of `runs` cold page loads."""
+    from playwright.sync_api import sync_playwright
+
+    samples = []
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch()
+        for _ in range(runs):
+            # A fresh context per run: empty HTTP cache, like a kiosk's cold boot.
+            context = browser.new_context()
+            page = context.new_page()
+            fonts = []
+            page.on("requestfinished", lambda request: request.resource_type == "font" and fonts.append(request))
+            page.goto(url, wait_until="load")
+            fcp = page.evaluate(
+                "new Promise((resolve) => new PerformanceObserver((list, observer) => {"
+                " const entry = list.getEntriesByName('first-contentful-paint')[0];"
+                " if (entry) { observer.disconnect(); resolve(entry.startTime); } })"
+                ".observe({type: 'paint', buffered: true}))"
+            )
+            samples.append({
+                "fcp_ms": fcp,
+                "font_requests": len(fonts),
+                "font_bytes": sum(request.sizes()["responseBodySize"] for request in fonts),
+                "third_party": sum("fonts.gstatic.com" in request.url for request in fonts),
+            })
+            context.close()
+        browser.close()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vendor the app's Google Fonts into assets/fonts.")
+    parser.add_argument("--subsets", default="latin", help="Comma-separated unicode subsets to keep")
+    parser.add_argument("--preload", default="JetBrains Mono", help="Comma-separated families to preload")
+    parser.add_argument("--measure", metavar="URL", help="Measure first contentful paint of a running app instead")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    if args.measure:
+        samples = measure(args.measure, args.runs)
+        fcp = [sample["fcp_ms"] for sample in samples]
+        print(
+            f"[FONTS] {'Google Fonts' if samples[0]['third_party'] else 'vendored'}: FCP median {statistics.median(fcp):.0f} ms"
+            f"  max {max(fcp):.0f} ms  fonts {samples[0]['font_requests']} requests,"
+            f" {samples[0]['font_bytes'] / 1024:.0f} KiB over {len(samples)} cold loads"
+        )
+        return
+    try:
+        manifest = vendor(
+            {s.strip() for s in args.subsets.split(",")},
+            {f.strip() for f in args.preload.split(",")},
+        )
+    except (httpx.HTTPError, OSError, ValueError) as e:
+        raise SystemExit(f"[FONTS] {e}")
+    size = sum(os.path.getsize(os.path.join(FONTS_DIR, name)) for name in manifest["files"])
+    print(f"[FONTS] {len(manifest['files'])} files ({size / 1024:.0f} KiB), {len(manifest['preload'])} preloaded -> {FONTS_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+
+import httpx
+import reflex as rx
+
+from .settings import Setting
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 negotiation in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class GridClient:
+    """
+    Async, pooled HTTP client for the GRID GraphQL endpoint.
+
+    A single client is shared by every kiosk session on the backend so the
+    TLS handshake is paid once and requests reuse keep-alive (or HTTP/2)
+    connections. A semaphore caps the number of in-flight GRID requests.
+    """
+
+    max_concurrency = Setting("grid_max_concurrency", 8, int)
+
+    def __init__(self, max_concurrency: int | None = None, timeout: float = 5.0, transport: httpx.AsyncBaseTransport | None = None):
+        self._max_concurrency = max_concurrency
+        self._timeout = timeout
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=self._timeout,
+                transport=self._transport or fixture_transport(),
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                    keepalive_expiry=60.0,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def post_json(self, url: str, payload: dict, headers: dict) -> dict:
+        """
+        POST a JSON payload and return the decoded JSON body.
+        Raises httpx.HTTPError on transport errors or non-2xx responses.
+        """
+        client = self._ensure_client()
+        async with self._semaphore:
+            response = await client.post(url, json=payload, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._semaphore = None
+
+
+def request_key(query: str, variables: dict | None = None) -> str:
+    """Canonical form of a GraphQL request: whitespace-insensitive query plus sorted variables."""
+    return json.dumps([" ".join(query.split()), variables or {}], sort_keys=True)
+
+
+class RecordedGridTransport(httpx.AsyncBaseTransport):
+    """
+    Offline stand-in for the GRID endpoint. Each GraphQL request is answered
+    from <directory>/<hash of query and variables>.json; unknown requests get
+    a 404. With record=True, unknown requests go to the real endpoint and
+    successful responses are saved as new fixtures.
+    """
+
+    def __init__(self, directory: str, record: bool = False):
+        self.directory = directory
+        self.record = record
+        self._live = httpx.AsyncHTTPTransport(http2=HTTP2_AVAILABLE) if record else None
+
+    @staticmethod
+    def fixture_name(query: str, variables: dict | None = None) -> str:
+        digest = hashlib.sha1(request_key(query, variables).encode()).hexdigest()
+        return f"{digest[:16]}.json"
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(await request.aread() or b"{}")
+        path = os.path.join(self.directory, self.fixture_name(payload.get("query", ""), payload.get("variables")))
+        if os.path.exists(path):
+            with open(path) as f:
+                return httpx.Response(200, json=json.load(f)["response"])
+        if self._live is None:
+            return httpx.Response(404, json={"errors": [{"message": f"No recorded fixture {os.path.basename(path)}"}]})
+
+        response = await self._live.handle_async_request(request)
+        content = await response.aread()
+        if response.status_code == 200:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, "w") as f:
+                json.dump({"query": payload.get("query"), "variables": payload.get("variables"), "response": json.loads(content)}, f, indent=2)
+        # aread() already decoded the body, so drop the transfer headers that describe the wire format.
+        headers = [(k, v) for k, v in response.headers.items() if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")]
+        return httpx.Response(response.status_code, headers=headers, content=content)
+
+    async def aclose(self):
+        if self._live is not None:
+            await self._live.aclose()
+
+
+def fixture_transport() -> RecordedGridTransport | None:
+    """The fixture transport when grid_fixtures_dir is configured, else None (real network)."""
+    config = rx.config.get_config()
+    directory = getattr(config, "grid_fixtures_dir", None)
+    if not directory:
+        return None
+    return RecordedGridTransport(directory, record=bool(getattr(config, "grid_fixtures_record", False)))
+
+
+# One connection pool per backend worker: every kiosk's GRID calls share the handshake.
+grid_client = GridClient()
+
+
+@contextlib.asynccontextmanager
+async def grid_client_lifespan():
+    """Close the pooled GRID connections when the backend shuts down."""
+    try:
+        yield
+    finally:
+        await grid_client.aclose()
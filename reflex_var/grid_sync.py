@@ -0,0 +1,279 @@
+"""
+Incremental GRID sync into the clutch catalog.
+
+Instead of asking for the first N series on every game, a background worker
+pages through series updated since the previous sync and, per series, only
+the events after its stored GraphQL cursor. Cursors and last-seen event
+timestamps live next to the clips in the catalog file, so a restarted or
+interrupted sync resumes where it stopped.
+
+    python -m reflex_var.grid_sync --once
+    GRID_FIXTURES_DIR=fixtures/grid python -m reflex_var.grid_sync --once   # offline
+"""
+
+import argparse
+import asyncio
+import logging
+import sqlite3
+import time
+
+from .catalog import SOURCE_GRID, clutch_catalog, connect, insert_clips, library_clips
+from .circuit_breaker import CircuitOpenError
+from .grid_service import GridService
+from .importer import ImportStats, to_clips
+from .settings import Setting
+
+logger = logging.getLogger(__name__)
+
+SYNC_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_cursor (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS series_sync (
+    series_id TEXT PRIMARY KEY,
+    event_cursor TEXT,
+    last_event_at TEXT,
+    synced_at REAL NOT NULL
+);
+"""
+
+# Only the fields the kiosk shows or scores against are requested.
+SERIES_QUERY = """
+    query SyncValorantSeries($first: Int!, $after: Cursor, $updatedSince: DateTime) {
+        allSeries(first: $first, after: $after, filter: {title: {contains: "VALORANT"}, updatedAt: {gt: $updatedSince}}) {
+            pageInfo { hasNextPage endCursor }
+            edges { node { id name updatedAt } }
+        }
+    }
+    """
+
+EVENTS_QUERY = """
+    query SyncSeriesEvents($id: ID!, $first: Int!, $after: Cursor) {
+        series(id: $id) {
+            events(first: $first, after: $after) {
+                pageInfo { hasNextPage endCursor }
+                edges {
+                    node {
+                        type
+                        timestamp
+                        ... on ValorantEvent {
+                            position { x y }
+                            player { name }
+                        }
+                    }
+                }
+            }
+        }
+    }
+    """
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    connection = connect(path)
+    connection.executescript(SYNC_SCHEMA)
+    # A brand-new catalog file starts from the validated library so the
+    # kiosk keeps those clips once the file takes over from the built-ins.
+    if connection.execute("SELECT 1 FROM clip LIMIT 1").fetchone() is None:
+        with connection:
+            insert_clips(connection, library_clips(), on_conflict="IGNORE")
+    return connection
+
+
+def _read_cursors(path: str) -> dict[str, str | None]:
+    connection = _connect(path)
+    try:
+        return dict(connection.execute("SELECT name, value FROM sync_cursor"))
+    finally:
+        connection.close()
+
+
+def _write_cursors(path: str, values: dict[str, str | None]):
+    connection = _connect(path)
+    try:
+        with connection:
+            connection.executemany("INSERT OR REPLACE INTO sync_cursor (name, value) VALUES (?, ?)", values.items())
+    finally:
+        connection.close()
+
+
+def _read_series(path: str, series_id: str) -> tuple[str | None, str | None]:
+    connection = _connect(path)
+    try:
+        row = connection.execute(
+            "SELECT event_cursor, last_event_at FROM series_sync WHERE series_id = ?", (series_id,)
+        ).fetchone()
+        return row or (None, None)
+    finally:
+        connection.close()
+
+
+def _write_series(path: str, series_id: str, clips: list, event_cursor: str | None, last_event_at: str | None) -> int:
+    """Store a series' new clips and its advanced cursor in one transaction."""
+    connection = _connect(path)
+    try:
+        with connection:
+            inserted = insert_clips(connection, clips, on_conflict="IGNORE")
+            connection.execute(
+                "INSERT OR REPLACE INTO series_sync (series_id, event_cursor, last_event_at, synced_at) VALUES (?, ?, ?, ?)",
+                (series_id, event_cursor, last_event_at, time.time()),
+            )
+        return inserted
+    finally:
+        connection.close()
+
+
+class GridSync:
+    """
+    Background worker that keeps the clutch catalog current from GRID.
+
+    Each pass walks allSeries filtered to series updated after the last
+    completed pass (the page cursor is persisted so an interrupted pass
+    resumes), then fetches each series' events after its own stored cursor.
+    New clips go into the catalog file and the in-memory catalog.
+    """
+
+    interval = Setting("grid_sync_interval", 300)
+    page_size = Setting("grid_sync_page_size", 50, int)
+
+    def __init__(self, interval: float | None = None, page_size: int | None = None, events_page_size: int = 100):
+        self._interval = interval
+        self._page_size = page_size
+        self.events_page_size = events_page_size
+        self.passes = 0
+        self.requests = 0
+        self.failures = 0
+        self.series_synced = 0
+        self.clips_added = 0
+        self.last_pass_seconds = 0.0
+        self.last_pass_at = 0.0
+        self.last: ImportStats | None = None
+
+    async def _query(self, query: str, variables: dict) -> dict:
+        self.requests += 1
+        data = await GridService._post_async(query, variables)
+        if data.get("errors"):
+            raise Exception(f"GRID error: {data['errors'][0].get('message', data['errors'])}")
+        return data.get("data") or {}
+
+    async def _sync_series(self, path: str, series_id: str, name: str, stats: ImportStats) -> list:
+        event_cursor, last_event_at = await asyncio.to_thread(_read_series, path, series_id)
+        new_clips = []
+        while True:
+            data = await self._query(EVENTS_QUERY, {"id": series_id, "first": self.events_page_size, "after": event_cursor})
+            events = ((data.get("series") or {}).get("events")) or {}
+            nodes = [edge["node"] for edge in events.get("edges") or []]
+            clips = list(to_clips(((series_id, name, node) for node in nodes), stats, source=SOURCE_GRID))
+            page = events.get("pageInfo") or {}
+            event_cursor = page.get("endCursor") or event_cursor
+            timestamps = [str(node["timestamp"]) for node in nodes if node.get("timestamp") is not None]
+            if timestamps:
+                last_event_at = max([last_event_at or "", *timestamps])
+            # Not `+= await`: other series update stats while this write is in flight.
+            inserted = await asyncio.to_thread(_write_series, path, series_id, clips, event_cursor, last_event_at)
+            stats.inserted += inserted
+            new_clips.extend(clips)
+            if not page.get("hasNextPage"):
+                break
+        self.series_synced += 1
+        return new_clips
+
+    async def sync_once(self) -> ImportStats:
+        """Run one incremental pass and return its counters."""
+        path = clutch_catalog.path
+        stats = ImportStats()
+        cursors = await asyncio.to_thread(_read_cursors, path)
+        updated_since = cursors.get("series.updated_since")
+        after = cursors.get("series.after")
+        newest = cursors.get("series.updated_seen") or updated_since
+
+        while True:
+            data = await self._query(SERIES_QUERY, {"first": self.page_size, "after": after, "updatedSince": updated_since})
+            series = data.get("allSeries") or {}
+            nodes = [edge["node"] for edge in series.get("edges") or []]
+            results = await asyncio.gather(*(
+                self._sync_series(path, str(node["id"]), node.get("name") or str(node["id"]), stats) for node in nodes
+            ))
+            clutch_catalog.add(clip for clips in results for clip in clips)
+            for node in nodes:
+                if node.get("updatedAt") and (newest is None or node["updatedAt"] > newest):
+                    newest = node["updatedAt"]
+
+            page = series.get("pageInfo") or {}
+            if not page.get("hasNextPage"):
+                break
+            after = page.get("endCursor")
+            # Resume point if the process stops mid-pass.
+            await asyncio.to_thread(_write_cursors, path, {"series.after": after, "series.updated_seen": newest})
+
+        # Pass complete: the next one only asks for series updated after this one.
+        await asyncio.to_thread(_write_cursors, path, {"series.after": None, "series.updated_since": newest, "series.updated_seen": None})
+        return stats
+
+    async def run(self):
+        """Lifespan task: sync every grid_sync_interval seconds while GRID is reachable."""
+        try:
+            GridService._check_api_key()
+        except Exception as e:
+            logger.info("GRID sync disabled: %s", e)
+            return
+        while True:
+            started = time.perf_counter()
+            try:
+                self.last = await self.sync_once()
+                self.passes += 1
+                self.clips_added += self.last.inserted
+                self.last_pass_at = time.time()
+            except asyncio.CancelledError:
+                raise
+            except CircuitOpenError:
+                pass
+            except Exception as e:
+                self.failures += 1
+                logger.warning("GRID sync pass failed: %s", e)
+            self.last_pass_seconds = time.perf_counter() - started
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> dict:
+        return {
+            "passes": self.passes,
+            "requests": self.requests,
+            "failures": self.failures,
+            "series_synced": self.series_synced,
+            "clips_added": self.clips_added,
+            "last_pass_seconds": self.last_pass_seconds,
+            "last_pass_at": self.last_pass_at,
+        }
+
+
+grid_sync = GridSync()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally sync GRID series and events into the clutch catalog.")
+    parser.add_argument("--once", action="store_true", help="Run a single pass and exit")
+    args = parser.parse_args()
+
+    async def sync():
+        from .grid_client import grid_client
+
+        try:
+            if args.once:
+                GridService._check_api_key()
+                stats = await grid_sync.sync_once()
+                print(
+                    f"[GRID_SYNC] {grid_sync.series_synced} series  {stats.events} events  {stats.inserted} new  "
+                    f"{stats.skipped} skipped  {grid_sync.requests} requests"
+                )
+            else:
+                await grid_sync.run()
+        except Exception as e:
+            print(f"[GRID_SYNC] {e}")
+        finally:
+            await grid_client.aclose()
+
+    asyncio.run(sync())
+
+
+if __name__ == "__main__":
+    main()
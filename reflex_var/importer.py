@@ -0,0 +1,315 @@
+"""
+Streaming importer for offline GRID exports into the clutch catalog.
+
+    python -m reflex_var.importer series-2026-01.jsonl.gz dump.json --batch-size 5000
+
+Accepts JSONL (one GraphQL response, series node, edge or flat event per
+line) and GraphQL response dumps ({"data": {"allSeries": {"edges": [...]}}},
+several may be concatenated), optionally gzip-compressed. Each stage is a
+generator, so memory stays bounded by one batch plus one series node no
+matter how large the dump is. Clips are deduplicated on
+(series id, event type, timestamp); the first copy wins. Restart the app
+(or call clutch_catalog.load(force=True)) to pick up new clips.
+
+Reproduce the import timing on a synthetic multi-GB dump:
+
+    python -m reflex_var.importer --generate /tmp/synthetic.jsonl --size-mb 4096
+    python -m reflex_var.importer /tmp/synthetic.jsonl --catalog /tmp/bench_catalog.db
+"""
+
+import argparse
+import dataclasses
+import gzip
+import io
+import json
+import os
+import random
+import sys
+import time
+from typing import Callable, Iterable, Iterator
+
+from .catalog import SCHEMA, DEFAULT_CLIP_DURATION, INDEXED_FIELDS, SOURCE_IMPORT, Clip, clip_key, clutch_catalog, connect, insert_clips
+
+_CHUNK_SIZE = 1 << 20
+
+
+@dataclasses.dataclass
+class ImportStats:
+    bytes_read: int = 0
+    bytes_total: int = 0
+    events: int = 0
+    inserted: int = 0
+    skipped: int = 0
+    started: float = dataclasses.field(default_factory=time.perf_counter)
+
+    @property
+    def duplicates(self) -> int:
+        return self.events - self.skipped - self.inserted
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def line(self) -> str:
+        percent = f" {100 * self.bytes_read / self.bytes_total:5.1f}%" if self.bytes_total else ""
+        return (
+            f"{self.bytes_read / 1e6:,.0f} MB{percent}  {self.events:,} events  {self.inserted:,} new  "
+            f"{self.duplicates:,} dup  {self.skipped:,} skipped  {self.events / max(self.elapsed, 1e-9):,.0f} events/s"
+        )
+
+
+def _open(path: str, stats: ImportStats) -> tuple[io.TextIOBase, Callable[[], None]]:
+    raw = open(path, "rb")
+    stats.bytes_total += os.path.getsize(path)
+    offset = stats.bytes_read
+    stream = gzip.open(raw) if path.endswith(".gz") else raw
+
+    def tick():
+        # Progress is measured on the file as stored, compressed or not.
+        stats.bytes_read = offset + raw.tell()
+
+    return io.TextIOWrapper(stream, encoding="utf-8"), tick
+
+
+def _read_jsonl(text: io.TextIOBase, tick: Callable[[], None]) -> Iterator[dict]:
+    for number, line in enumerate(text, 1):
+        if number % 1024 == 0:
+            tick()
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+    tick()
+
+
+def _read_graphql(text: io.TextIOBase, tick: Callable[[], None]) -> Iterator[dict]:
+    """Yield each element of every "edges" array without loading the document."""
+    decoder = json.JSONDecoder()
+    buffer, position, eof = "", 0, False
+
+    def fill() -> bool:
+        nonlocal buffer, position, eof
+        chunk = text.read(_CHUNK_SIZE)
+        tick()
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
+
+    in_edges = False
+    while True:
+        if not in_edges:
+            found = buffer.find('"edges"', position)
+            bracket = buffer.find("[", found) if found != -1 else -1
+            if bracket == -1:
+                # Keep a short tail in case the key straddles two chunks.
+                position = max(position, len(buffer) - 16)
+                if not fill():
+                    return
+                continue
+            position, in_edges = bracket + 1, True
+
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if position >= len(buffer):
+            if not fill():
+                raise ValueError("Unexpected end of GraphQL dump inside an edges array")
+            continue
+        if buffer[position] == "]":
+            position, in_edges = position + 1, False
+            continue
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof or not fill():
+                raise
+            continue
+        position = end
+        yield item
+
+
+def _events(records: Iterable[dict]) -> Iterator[tuple[str, str, dict]]:
+    """Flatten any supported record shape into (series_id, match, event)."""
+    for record in records:
+        if "data" in record:
+            edges = (record.get("data") or {}).get("allSeries", {}).get("edges", [])
+            yield from _events(edges)
+            continue
+        node = record.get("node", record)
+        if "events" in node:
+            series_id = str(node.get("id", ""))
+            title = node.get("title")
+            match = node.get("name") or (title.get("name") if isinstance(title, dict) else title) or series_id
+            for event in node.get("events") or []:
+                yield series_id, match, event
+        else:
+            # Flat event record, e.g. one line of a per-event export.
+            series_id = str(node.get("series_id") or node.get("seriesId") or "")
+            yield series_id, node.get("match") or series_id, node
+
+
+def to_clips(events: Iterable[tuple[str, str, dict]], stats: ImportStats, source: str = SOURCE_IMPORT) -> Iterator[Clip]:
+    """Turn (series_id, match, GRID event) tuples into Clips, skipping unusable events."""
+    for series_id, match, event in events:
+        stats.events += 1
+        try:
+            event_type = event["type"]
+            timestamp = str(event["timestamp"])
+            position = event["position"]
+            x, y = float(position["x"]), float(position["y"])
+        except (KeyError, TypeError, ValueError):
+            stats.skipped += 1
+            continue
+        # The kiosk scores in normalized 0-1 screen space.
+        if not series_id or not (0.0 <= x <= 1.0 and 0.0 <= y <= 1.0):
+            stats.skipped += 1
+            continue
+        player = event.get("player")
+        yield Clip(
+            clip_id=clip_key(series_id, event_type, timestamp),
+            player=(player.get("name") if isinstance(player, dict) else player) or "UNKNOWN",
+            event=event_type,
+            timestamp=timestamp,
+            target_x=x,
+            target_y=y,
+            series_id=series_id,
+            match=match,
+            clip_duration=float(event.get("clip_duration", DEFAULT_CLIP_DURATION)),
+            weight=float(event.get("weight", 1.0)),
+            source=source,
+        )
+
+
+def _batched(clips: Iterable[Clip], size: int) -> Iterator[list[Clip]]:
+    batch = []
+    for clip in clips:
+        batch.append(clip)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def detect_format(path: str) -> str:
+    name = path[:-3] if path.endswith(".gz") else path
+    return "jsonl" if name.endswith((".jsonl", ".ndjson")) else "graphql"
+
+
+def import_dumps(
+    paths: list[str],
+    catalog_path: str,
+    batch_size: int = 5000,
+    fmt: str = "auto",
+    progress_interval: float = 2.0,
+    progress=print,
+) -> ImportStats:
+    """
+    Stream every dump into the catalog file, one transaction per batch.
+    Secondary indexes are dropped for the load and rebuilt once at the end
+    (connect() recreates them if an import is interrupted).
+    """
+    stats = ImportStats()
+    connection = connect(catalog_path)
+    connection.execute("PRAGMA synchronous = NORMAL")
+    connection.execute("PRAGMA cache_size = -65536")
+    for field in INDEXED_FIELDS:
+        connection.execute(f"DROP INDEX IF EXISTS ix_clip_{field}")
+    last_report = time.perf_counter()
+    try:
+        for path in paths:
+            text, tick = _open(path, stats)
+            with text:
+                reader = _read_jsonl if (detect_format(path) if fmt == "auto" else fmt) == "jsonl" else _read_graphql
+                for batch in _batched(to_clips(_events(reader(text, tick)), stats), batch_size):
+                    with connection:
+                        stats.inserted += insert_clips(connection, batch, on_conflict="IGNORE")
+                    if progress and time.perf_counter() - last_report >= progress_interval:
+                        last_report = time.perf_counter()
+                        progress(f"[IMPORT] {stats.line()}")
+        if progress:
+            progress("[IMPORT] rebuilding indexes")
+    finally:
+        connection.executescript(SCHEMA)
+        connection.close()
+    return stats
+
+
+def generate_dump(path: str, size_mb: float, events_per_series: int = 200, seed: int = 13) -> int:
+    """
+    Write a synthetic GRID dump of about size_mb uncompressed megabytes: JSONL
+    (one series node per line) or, for other names, one GraphQL response.
+    About 1% of events repeat an earlier one and 1% fall outside the screen,
+    so the dedup and skip paths are exercised. Returns the number of events.
+    """
+    rng = random.Random(seed)
+    target = int(size_mb * 1e6)
+    jsonl = detect_format(path) == "jsonl"
+    written = events = series = 0
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "wt", encoding="utf-8") as f:
+        if not jsonl:
+            written += f.write('{"data": {"allSeries": {"edges": [')
+        while written < target:
+            node_events = []
+            for index in range(events_per_series):
+                roll = rng.random()
+                if roll < 0.01 and node_events:
+                    node_events.append(node_events[-1])
+                    continue
+                node_events.append({
+                    "type": rng.choice(("VALORANT_KILL", "VALORANT_ABILITY", "VALORANT_PLANT", "VALORANT_DEFUSE")),
+                    "timestamp": f"00:{index // 60 % 60:02d}:{index % 60:02d}:{rng.randrange(100):02d}",
+                    "position": {"x": rng.uniform(1.0, 2.0) if roll > 0.99 else round(rng.random(), 4), "y": round(rng.random(), 4)},
+                    "player": {"name": f"PLAYER_{rng.randrange(500):03d}"},
+                })
+            node = {"id": f"synthetic-{series}", "name": f"Synthetic Series {series}", "events": node_events}
+            if jsonl:
+                written += f.write(json.dumps(node) + "\n")
+            else:
+                written += f.write(("," if series else "") + json.dumps({"node": node}))
+            events += len(node_events)
+            series += 1
+        if not jsonl:
+            f.write("]}}}")
+    return events
+
+
+def _peak_rss_mb() -> float | None:
+    """Peak resident memory of this process, or None where it is not available (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream offline GRID series dumps into the clutch catalog.")
+    parser.add_argument("dumps", nargs="*", help="JSONL or GraphQL response dumps (optionally .gz)")
+    parser.add_argument("--catalog", default=None, help="Catalog file (defaults to clutch_catalog_path)")
+    parser.add_argument("--format", choices=["auto", "jsonl", "graphql"], default="auto")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--generate", metavar="PATH", help="Write a synthetic dump to PATH instead of importing")
+    parser.add_argument("--size-mb", type=float, default=1024, help="Uncompressed size of the synthetic dump")
+    args = parser.parse_args()
+
+    if args.generate:
+        started = time.perf_counter()
+        events = generate_dump(args.generate, args.size_mb)
+        print(f"[IMPORT] wrote {events:,} events ({os.path.getsize(args.generate) / 1e6:,.0f} MB) to {args.generate}"
+              f" in {time.perf_counter() - started:.1f}s")
+        return
+    if not args.dumps:
+        parser.error("no dumps given")
+
+    stats = import_dumps(args.dumps, args.catalog or clutch_catalog.path, args.batch_size, args.format)
+    peak = _peak_rss_mb()
+    print(f"[IMPORT] done in {stats.elapsed:.1f}s: {stats.line()}" + (f"  peak RSS {peak:,.0f} MB" if peak is not None else ""))
+
+
+if __name__ == "__main__":
+    main()
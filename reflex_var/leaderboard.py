@@ -0,0 +1,344 @@
+"""
+Process-wide leaderboard: an in-process top-K of ScoreEntry rows and the
+broadcaster that pushes one shared snapshot to every kiosk.
+
+Benchmark against the old per-render query on a synthetic table, and
+event-handler latency for 50 concurrent sessions with sync (old) and async
+(new) database sessions:
+
+    python -m reflex_var.leaderboard --bench --rows 1000000 --sessions 50
+"""
+
+import argparse
+import asyncio
+import bisect
+import dataclasses
+import logging
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import uuid
+
+import reflex as rx
+from sqlmodel import func, select
+
+from .metrics import db_seconds, timed
+from .settings import Setting
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class LeaderboardRow:
+    """Plain, pre-serialized leaderboard row shared by every session."""
+    initials: str
+    accuracy: float
+    timestamp: str
+
+
+class TopKLeaderboard:
+    """
+    In-process top-K of ScoreEntry rows, ordered by accuracy descending.
+
+    Loaded once from the (accuracy-indexed) scoreentry table, then kept current
+    by submit_score instead of re-querying on every render. Ranks outside the
+    top-K come from an indexed COUNT query.
+    """
+
+    k = Setting("leaderboard_size", 5, int)
+
+    def __init__(self, k: int | None = None):
+        self._k = k
+        self._entries: list = []
+        # Parallel list of -accuracy so bisect keeps descending order.
+        self._keys: list[float] = []
+        self._loaded = False
+
+    @timed(db_seconds, operation="leaderboard_load")
+    async def _load(self):
+        from .state import ScoreEntry
+
+        try:
+            async with rx.asession() as asession:
+                rows = (await asession.exec(
+                    ScoreEntry.select().order_by(ScoreEntry.accuracy.desc()).limit(self.k)
+                )).all()
+        except Exception as e:
+            # Database not yet initialized; try again on the next read.
+            logger.warning("leaderboard load failed: %s", e)
+            return
+        self._entries = list(rows)
+        self._keys = [-row.accuracy for row in rows]
+        self._loaded = True
+
+    async def top(self) -> list:
+        if not self._loaded:
+            await self._load()
+        return list(self._entries)
+
+    def add(self, entry) -> bool:
+        """
+        Insert a newly committed entry. Returns True if the top-K changed.
+        """
+        if not self._loaded:
+            # The next top() loads from the DB, which already has the committed row.
+            return True
+        key = -entry.accuracy
+        # Ties keep the earlier submission ahead.
+        index = bisect.bisect_right(self._keys, key)
+        if index >= self.k:
+            return False
+        self._keys.insert(index, key)
+        self._entries.insert(index, entry)
+        del self._keys[self.k:]
+        del self._entries[self.k:]
+        return True
+
+    def invalidate(self):
+        self._loaded = False
+
+    @staticmethod
+    @timed(db_seconds, operation="rank_for")
+    async def rank_for(accuracy: float) -> int:
+        """1-based rank of a score: one plus the number of strictly better scores."""
+        from .state import ScoreEntry
+
+        async with rx.asession() as asession:
+            better = (await asession.exec(
+                select(func.count()).select_from(ScoreEntry).where(ScoreEntry.accuracy > accuracy)
+            )).one()
+        return better + 1
+
+
+class LeaderboardBroadcaster:
+    """
+    Owns the one process-wide leaderboard snapshot and pushes it to every
+    connected kiosk. Submissions only mark the snapshot dirty; a lifespan task
+    rebuilds it at most once per leaderboard_broadcast_interval seconds, so a
+    burst of scores costs one rebuild and one push per session.
+    """
+
+    interval = Setting("leaderboard_broadcast_interval", 1.0)
+
+    def __init__(self, leaderboard: TopKLeaderboard, interval: float | None = None):
+        self.leaderboard = leaderboard
+        self._interval = interval
+        self._dirty: asyncio.Event | None = None
+        self._last_rebuild = float("-inf")
+        # Versions are unique per process so sessions restored from a persisted
+        # state manager never mistake a fresh snapshot for one they already have.
+        self._epoch = uuid.uuid4().hex[:8]
+        self.version = ""
+        self.rows: list[LeaderboardRow] = []
+        self.rebuilds = 0
+
+    @property
+    def dirty(self) -> asyncio.Event:
+        if self._dirty is None:
+            self._dirty = asyncio.Event()
+        return self._dirty
+
+    def request_rebuild(self):
+        self.dirty.set()
+
+    async def rebuild(self) -> list[LeaderboardRow]:
+        self.rows = [
+            LeaderboardRow(initials=entry.initials, accuracy=entry.accuracy, timestamp=entry.timestamp)
+            for entry in await self.leaderboard.top()
+        ]
+        self.rebuilds += 1
+        self.version = f"{self._epoch}:{self.rebuilds}"
+        self._last_rebuild = time.monotonic()
+        return self.rows
+
+    async def current(self) -> tuple[str, list[LeaderboardRow]]:
+        if not self.version:
+            await self.rebuild()
+        return self.version, self.rows
+
+    async def push(self):
+        """Write the current snapshot into every connected session's LeaderboardState."""
+        from reflex.state import _substate_key
+        from reflex.utils.prerequisites import get_app
+        from .state import LeaderboardState
+
+        app = get_app().app
+        if app.event_namespace is None:
+            return
+        for token in list(app.event_namespace.token_to_sid):
+            try:
+                async with app.modify_state(_substate_key(token, LeaderboardState)) as root:
+                    board = await root.get_state(LeaderboardState)
+                    board._apply_snapshot(self.version, self.rows)
+            except Exception as e:
+                logger.warning("leaderboard push to %s failed: %s", token, e)
+
+    async def run(self):
+        """Lifespan task: coalesce submissions into periodic rebuild + push."""
+        while True:
+            await self.dirty.wait()
+            wait = self.interval - (time.monotonic() - self._last_rebuild)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self.dirty.clear()
+            await self.rebuild()
+            await self.push()
+
+
+# Handlers rank against leaderboard_cache; the broadcaster pushes its snapshots to kiosks.
+leaderboard_cache = TopKLeaderboard()
+leaderboard_broadcaster = LeaderboardBroadcaster(leaderboard_cache)
+
+
+def _bench_table(path: str, rows: int):
+    """scoreentry as created by the migrations, minus the accuracy index, filled with random scores."""
+    connection = sqlite3.connect(path)
+    try:
+        connection.execute(
+            "CREATE TABLE scoreentry (id INTEGER PRIMARY KEY, initials TEXT NOT NULL, accuracy FLOAT NOT NULL,"
+            " timestamp TEXT NOT NULL, user_x FLOAT, user_y FLOAT, target_x FLOAT, target_y FLOAT, event_type TEXT)"
+        )
+        rng = random.Random(7)
+        for start in range(0, rows, 100_000):
+            connection.executemany(
+                "INSERT INTO scoreentry (initials, accuracy, timestamp) VALUES (?, ?, '00:00:00:00')",
+                ((f"B{i % 100:02d}", round(rng.uniform(0, 100), 1)) for i in range(start, min(rows, start + 100_000))),
+            )
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def _timings(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def _async_timings(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def _report(label: str, samples: list[float]):
+    samples = sorted(samples)
+    print(
+        f"[LEADERBOARD] {label:<52} p50 {statistics.median(samples) * 1e3:9.3f} ms"
+        f"  p95 {samples[int(len(samples) * 0.95)] * 1e3:9.3f} ms"
+    )
+
+
+def bench(path: str, repeat: int = 50):
+    """Old: top 5 re-queried from an unindexed table on every render. New: indexed load once, top-K in memory."""
+    connection = sqlite3.connect(path)
+    try:
+        top = "SELECT * FROM scoreentry ORDER BY accuracy DESC LIMIT 5"
+        rank = "SELECT count(*) FROM scoreentry WHERE accuracy > ?"
+        _report("old: leaderboard render (ORDER BY, no index)", _timings(lambda: connection.execute(top).fetchall(), repeat))
+        _report("old: rank COUNT (no index)", _timings(lambda: connection.execute(rank, (95.0,)).fetchone(), repeat))
+
+        started = time.perf_counter()
+        connection.execute("CREATE INDEX ix_scoreentry_accuracy ON scoreentry (accuracy)")
+        connection.commit()
+        print(f"[LEADERBOARD] index build {time.perf_counter() - started:.2f}s")
+
+        _report("new: top-K load (indexed, once per process)", _timings(lambda: connection.execute(top).fetchall(), repeat))
+        rows = connection.execute(top).fetchall()
+        cache = TopKLeaderboard(k=5)
+        cache._entries, cache._keys, cache._loaded = [LeaderboardRow(r[1], r[2], r[3]) for r in rows], [-r[2] for r in rows], True
+        _report("new: leaderboard render (in-process top-K)", asyncio.run(_async_timings(cache.top, repeat)))
+        _report("new: rank COUNT (indexed)", _timings(lambda: connection.execute(rank, (95.0,)).fetchone(), repeat))
+    finally:
+        connection.close()
+
+
+def bench_sessions(path: str, sessions: int, rounds: int = 20):
+    """
+    Each round, every session fires a DB-backed handler (rank COUNT + top 5,
+    as submit_score and the leaderboard load do) and a handler that touches
+    no database, all at once. Latency runs from dispatch to completion.
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlmodel import Session
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    from .state import ScoreEntry
+
+    rank = select(func.count()).select_from(ScoreEntry).where(ScoreEntry.accuracy > 95.0)
+    top = select(ScoreEntry).order_by(ScoreEntry.accuracy.desc()).limit(5)
+    pool = {"pool_size": 10, "max_overflow": 20}
+    sync_engine = create_engine(f"sqlite:///{path}", **pool)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", **pool)
+
+    async def sync_db_handler():
+        with Session(sync_engine) as session:
+            session.exec(rank).one()
+            session.exec(top).all()
+
+    async def async_db_handler():
+        async with AsyncSession(async_engine) as session:
+            (await session.exec(rank)).one()
+            (await session.exec(top)).all()
+
+    async def ui_handler():
+        await asyncio.sleep(0)
+
+    async def timed_call(handler, dispatched: float, samples: list[float]):
+        await handler()
+        samples.append(time.perf_counter() - dispatched)
+
+    async def run(db_handler) -> tuple[list[float], list[float]]:
+        db, ui = [], []
+        for _ in range(rounds):
+            dispatched = time.perf_counter()
+            await asyncio.gather(*(
+                call for _ in range(sessions)
+                for call in (timed_call(db_handler, dispatched, db), timed_call(ui_handler, dispatched, ui))
+            ))
+        return db, ui
+
+    async def both():
+        results = {"old (sync session)": await run(sync_db_handler), "new (async session)": await run(async_db_handler)}
+        await async_engine.dispose()
+        return results
+
+    for label, (db, ui) in asyncio.run(both()).items():
+        _report(f"{label}: DB handler, {sessions} sessions", db)
+        _report(f"{label}: non-DB handler, {sessions} sessions", ui)
+    sync_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the leaderboard against the old per-render query.")
+    parser.add_argument("--bench", action="store_true", help="Run the top-K and rank benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Synthetic scoreentry rows")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--sessions", type=int, default=0, help="Also time handlers for this many concurrent sessions")
+    args = parser.parse_args()
+    if not args.bench:
+        parser.print_help()
+        return
+
+    with tempfile.TemporaryDirectory(prefix="leaderboard_bench_") as directory:
+        path = os.path.join(directory, "bench.db")
+        started = time.perf_counter()
+        _bench_table(path, args.rows)
+        print(f"[LEADERBOARD] {args.rows} rows written in {time.perf_counter() - started:.1f}s")
+        bench(path, args.repeat)
+        if args.sessions:
+            bench_sessions(path, args.sessions)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+import asyncio
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+import httpx
+import reflex as rx
+from starlette.responses import FileResponse
+
+from .settings import Setting, setting
+
+logger = logging.getLogger(__name__)
+
+
+class CountingFileResponse(FileResponse):
+    """FileResponse (with Starlette's Range handling) that reports body bytes sent."""
+
+    def __init__(self, *args, on_bytes=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._on_bytes = on_bytes
+
+    async def __call__(self, scope, receive, send):
+        async def counting_send(message):
+            if message["type"] == "http.response.body" and self._on_bytes:
+                self._on_bytes(len(message.get("body", b"")))
+            await send(message)
+
+        await super().__call__(scope, receive, counting_send)
+
+
+class MediaCache:
+    """
+    Disk-backed LRU cache of clip videos, served by the Reflex backend.
+
+    Remote clips for every catalogued series are downloaded ahead of time
+    into media_cache_dir (named by a hash of the remote URL) and evicted
+    least-recently-used once media_cache_max_bytes is exceeded. The resolver
+    hands kiosks the local /media URL whenever a clip is on disk, so a slow
+    or unreachable CDN no longer means a black screen mid-game.
+    """
+
+    directory = Setting("media_cache_dir", ".media_cache", str)
+    max_bytes = Setting("media_cache_max_bytes", 2 * 1024**3, int)
+
+    def __init__(self, directory: str | None = None, max_bytes: int | None = None):
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._files: OrderedDict[str, int] | None = None
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.bytes_served = 0
+        self.requests = 0
+        self.range_requests = 0
+        self.fetched = 0
+        self.fetch_failures = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @property
+    def files(self) -> OrderedDict[str, int]:
+        """name -> size, least recently used first; rebuilt from disk on first use."""
+        if self._files is None:
+            os.makedirs(self.directory, exist_ok=True)
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and not entry.name.endswith(".part"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.name, stat.st_size))
+            self._files = OrderedDict((name, size) for _, name, size in sorted(entries))
+        return self._files
+
+    @property
+    def bytes_cached(self) -> int:
+        return sum(self.files.values())
+
+    @staticmethod
+    def name_for(remote_url: str) -> str:
+        extension = os.path.splitext(urlparse(remote_url).path)[1] or ".mp4"
+        return hashlib.sha1(remote_url.encode()).hexdigest()[:20] + extension
+
+    def path_for(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _touch(self, name: str):
+        self.files.move_to_end(name)
+        # mtime carries the LRU order across restarts.
+        try:
+            os.utime(self.path_for(name))
+        except OSError:
+            pass
+
+    def local_url(self, remote_url: str) -> str | None:
+        """Backend URL of the cached copy of remote_url, or None if it is not on disk."""
+        if not self.enabled:
+            return None
+        name = self.name_for(remote_url)
+        if name not in self.files:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touch(name)
+        return f"{rx.config.get_config().api_url.rstrip('/')}/media/{name}"
+
+    def _evict_for(self, incoming: int):
+        total = self.bytes_cached
+        while self.files and total + incoming > self.max_bytes:
+            name, size = self.files.popitem(last=False)
+            total -= size
+            self.evictions += 1
+            try:
+                os.remove(self.path_for(name))
+            except OSError as e:
+                logger.warning("media cache: evict %s failed: %s", name, e)
+
+    async def _download(self, client: httpx.AsyncClient, remote_url: str, name: str):
+        path = self.path_for(name)
+        partial = f"{path}.part"
+        size = 0
+        try:
+            async with client.stream("GET", remote_url) as response:
+                response.raise_for_status()
+                with open(partial, "wb") as f:
+                    async for chunk in response.aiter_bytes(1 << 16):
+                        size += len(chunk)
+                        if size > self.max_bytes:
+                            raise ValueError(f"{remote_url} is larger than the media cache budget")
+                        f.write(chunk)
+            self._evict_for(size)
+            os.replace(partial, path)
+            self.files[name] = size
+            self.fetched += 1
+        except Exception as e:
+            self.fetch_failures += 1
+            logger.warning("media cache: download %s failed: %s", remote_url, e)
+            if os.path.exists(partial):
+                os.remove(partial)
+        finally:
+            self._inflight.pop(name, None)
+
+    async def ensure(self, client: httpx.AsyncClient, remote_url: str):
+        """Download remote_url unless it is cached or already being fetched."""
+        name = self.name_for(remote_url)
+        if name in self.files:
+            return
+        task = self._inflight.get(name)
+        if task is None:
+            task = self._inflight[name] = asyncio.create_task(self._download(client, remote_url, name))
+        await task
+
+    async def prefetch_catalog(self):
+        """Cache the clip for every series in the clutch catalog."""
+        from .catalog import clutch_catalog
+        from .grid_service import MediaService
+
+        urls = {MediaService.remote_video_url(series_id) for series_id in clutch_catalog.values("series_id")}
+        urls.add(MediaService.FALLBACK_VIDEO)
+        async with httpx.AsyncClient(timeout=60.0, follow_redirects=True) as client:
+            for url in urls:
+                await self.ensure(client, url)
+
+    async def run(self):
+        """Lifespan task: prefetch at startup and again as the catalog grows."""
+        if not self.enabled:
+            return
+        interval = setting("media_prefetch_interval", 600, float)
+        while True:
+            try:
+                await self.prefetch_catalog()
+            except Exception as e:
+                logger.warning("media cache: prefetch failed: %s", e)
+            await asyncio.sleep(interval)
+
+    def response(self, name: str, range_header: str | None) -> FileResponse | None:
+        """Range-capable response for a cached file, or None if it is not cached."""
+        if name not in self.files:
+            return None
+        self.requests += 1
+        if range_header:
+            self.range_requests += 1
+        self._touch(name)
+
+        def served(count: int):
+            self.bytes_served += count
+
+        return CountingFileResponse(
+            self.path_for(name),
+            media_type="video/mp4" if name.endswith(".mp4") else None,
+            headers={"Cache-Control": "public, max-age=86400"},
+            on_bytes=served,
+        )
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "files": len(self.files),
+            "bytes_cached": self.bytes_cached,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "requests": self.requests,
+            "range_requests": self.range_requests,
+            "bytes_served": self.bytes_served,
+            "fetched": self.fetched,
+            "fetch_failures": self.fetch_failures,
+            "evictions": self.evictions,
+        }
+
+
+media_cache = MediaCache()
@@ -0,0 +1,153 @@
+"""
+In-process latency histograms, exposed in Prometheus text format at /metrics.
+
+    with timed(grid_seconds, operation="post"):
+        ...
+
+    @timed(handler_seconds, handler="submit_score")
+    async def submit_score(self): ...
+
+Observing is a bisect and three additions, cheap enough for every event
+handler; there is no lock, so observe from the event loop thread.
+"""
+
+import bisect
+import functools
+import inspect
+import time
+
+# Seconds; covers sub-millisecond handlers up to a replay's length.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with one series per label set."""
+
+    def __init__(self, name: str, help: str, label: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label = label
+        self.buckets = buckets
+        # label value -> [per-bucket counts (+Inf last), sum, count]
+        self._series: dict[str, list] = {}
+
+    def observe(self, seconds: float, value: str):
+        series = self._series.get(value)
+        if series is None:
+            series = self._series[value] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect.bisect_left(self.buckets, seconds)] += 1
+        series[1] += seconds
+        series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for value, (counts, total, count) in sorted(self._series.items()):
+            label = f'{self.label}="{value}"'
+            cumulative = 0
+            for bound, bucket in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label}}} {total}")
+            lines.append(f"{self.name}_count{{{label}}} {count}")
+        return lines
+
+
+_registry: dict[str, Histogram] = {}
+
+
+def histogram(name: str, help: str, label: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+    """The registered histogram called name, created on first use."""
+    if name not in _registry:
+        _registry[name] = Histogram(name, help, label, buckets)
+    return _registry[name]
+
+
+class timed:
+    """
+    Observe elapsed wall time into a histogram series, as a context manager
+    or as a decorator for plain, async, and (async) generator functions.
+    """
+
+    def __init__(self, metric: Histogram, **label):
+        (self.value,) = label.values()
+        self.metric = metric
+        self._started = 0.0
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metric.observe(time.perf_counter() - self._started, self.value)
+        return False
+
+    def __call__(self, fn):
+        metric, value = self.metric, self.value
+
+        if inspect.isasyncgenfunction(fn):
+
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    async for update in fn(*args, **kwargs):
+                        yield update
+                finally:
+                    metric.observe(time.perf_counter() - started, value)
+
+        elif inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    metric.observe(time.perf_counter() - started, value)
+
+        elif inspect.isgeneratorfunction(fn):
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    yield from fn(*args, **kwargs)
+                finally:
+                    metric.observe(time.perf_counter() - started, value)
+
+        else:
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    metric.observe(time.perf_counter() - started, value)
+
+        return wrapper
+
+
+def render() -> str:
+    """All registered histograms in Prometheus text exposition format."""
+    lines = []
+    for metric in _registry.values():
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+handler_seconds = histogram(
+    "reflex_var_event_handler_seconds", "GameState event handler duration.", "handler",
+)
+phase_transition_seconds = histogram(
+    "reflex_var_phase_transition_seconds",
+    "Time from the triggering event to the next phase (IDLE->PLAYING from the START tap, "
+    "PLAYING->VAR_FREEZE from replay start, CLICK->RESULT from the scoring click's pointerdown to "
+    "the result's first paint, as the browser saw it). VAR_FREEZE->CLICK is how long the frozen "
+    "frame waited for the click: the player's think time, not latency.",
+    "transition",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 30.0, 60.0),
+)
+grid_seconds = histogram("reflex_var_grid_seconds", "GRID request and clutch fetch duration.", "operation")
+media_seconds = histogram("reflex_var_media_resolve_seconds", "Clip media (video and still) resolution duration.", "operation")
+db_seconds = histogram("reflex_var_db_seconds", "Database operation duration.", "operation")
@@ -0,0 +1,194 @@
+"""
+Replay playback: client-side timing scripts and first-frame stats.
+
+Browser benchmark of a full game (transition times, bytes on the wire):
+
+    python -m reflex_var.playback --bench http://localhost:3000 --games 10
+
+It drives a headless Chromium with Playwright, which is not a runtime
+dependency: pip install playwright && playwright install chromium.
+"""
+
+import argparse
+import statistics
+from collections import deque
+
+
+class FirstFrameStats:
+    """
+    Rolling time-to-first-frame samples reported by the kiosks: milliseconds
+    from the START tap to the replay's first rendered frame. Warm starts
+    (clip preloaded during IDLE) and cold starts are kept apart so /health
+    shows what the idle preload is worth.
+    """
+
+    def __init__(self, window: int = 500):
+        self._samples: dict[str, deque[float]] = {
+            "warm": deque(maxlen=window),
+            "cold": deque(maxlen=window),
+        }
+        self.count = 0
+        self.rejected = 0
+        self.last_ms = 0.0
+
+    def record(self, elapsed_ms: float, warm: bool):
+        # Negative or absurd values mean the tap mark was missing or stale.
+        if not 0 < elapsed_ms < 60_000:
+            self.rejected += 1
+            return
+        self._samples["warm" if warm else "cold"].append(elapsed_ms)
+        self.count += 1
+        self.last_ms = elapsed_ms
+
+    @staticmethod
+    def _summary(samples: deque[float]) -> dict:
+        if not samples:
+            return {"samples": 0, "avg_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0}
+        ordered = sorted(samples)
+        return {
+            "samples": len(ordered),
+            "avg_ms": sum(ordered) / len(ordered),
+            "p50_ms": ordered[len(ordered) // 2],
+            "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        }
+
+    def stats(self) -> dict:
+        return {
+            "count": self.count,
+            "rejected": self.rejected,
+            "last_ms": self.last_ms,
+            "warm": self._summary(self._samples["warm"]),
+            "cold": self._summary(self._samples["cold"]),
+        }
+
+
+# Process-wide time-to-first-frame samples, reported on /health.
+first_frame_stats = FirstFrameStats()
+
+# Box around the persistent replay <video>; it also takes the VAR_FREEZE click.
+FRAME_ID = "var-frame"
+
+# Marks the START tap on the client; the replay's first frame measures from it.
+TAP_MARK_SCRIPT = (
+    "document.addEventListener('pointerdown', () => { window.__varTapAt = performance.now(); }, true);"
+)
+# The replay's first `playing` event of a round reports ms since the tap. The
+# element persists across rounds, so REWIND_SCRIPT re-arms it each round and
+# later `playing` events (rebuffers, a replayed src) report nothing.
+FIRST_FRAME_SCRIPT = (
+    "(() => { if (!window.__varFirstFrame) { return null; } window.__varFirstFrame = false;"
+    " const tap = window.__varTapAt; window.__varTapAt = 0; return tap ? performance.now() - tap : -1; })()"
+)
+# The RESULT view's first paint reports ms since the pointerdown of the click
+# that scored (HIT_SCRIPT marks it): what the player waits for their result.
+# A RESULT view reached any other way (a reload) reports nothing.
+RESULT_RENDER_SCRIPT = (
+    "(() => { const click = window.__varClickAt; window.__varClickAt = 0; if (!click) { return null; }"
+    " return new Promise((done) => requestAnimationFrame(() => setTimeout(() => done(performance.now() - click)))); })()"
+)
+# The replay element is reused and every round of a clip has the same src, so
+# the player would resume wherever the last round paused; seek back to the start.
+REWIND_SCRIPT = (
+    f"(() => {{ window.__varFirstFrame = true; window.__varFreezeArmed = true;"
+    f" const v = document.querySelector('#{FRAME_ID} video'); if (v) {{ v.currentTime = 0; }} }})()"
+)
+
+
+def freeze_script(on_freeze: str) -> str:
+    """
+    Run on the replay's timeupdate: once playback reaches the event frame
+    (the player's data-freeze-at, the offset the still was taken at), pause
+    on exactly that frame and call on_freeze, a queueEvents callback. The
+    check runs in the browser, so timeupdates cost no websocket traffic and
+    the freeze waits for the clip however long it took to load.
+    """
+    return (
+        f"(() => {{ const v = document.querySelector('#{FRAME_ID} video');"
+        " if (!v || v.paused || !window.__varFreezeArmed) { return; }"
+        " const at = parseFloat(v.dataset.freezeAt); if (!(v.currentTime >= at)) { return; }"
+        f" window.__varFreezeArmed = false; v.pause(); v.currentTime = at; ({on_freeze})(); }})()"
+    )
+
+# Timestamps of the replay's media events, for the browser benchmark.
+_BENCH_INIT_SCRIPT = """
+window.__varBench = [];
+for (const type of ['playing', 'ended']) {
+    document.addEventListener(type, (e) => window.__varBench.push([type, performance.now(), e.target.currentTime]), true);
+}
+"""
+_FREEZE_READY = f"getComputedStyle(document.getElementById('{FRAME_ID}')).pointerEvents === 'auto'"
+
+
+def bench(url: str, games: int) -> list[dict]:
+    """Play `games` full rounds in a headless browser and time each transition."""
+    from playwright.sync_api import sync_playwright
+
+    def wait_for(condition: str, timeout: float = 60_000) -> float:
+        # Polled on animation frames in the page; returns the page's clock.
+        return page.wait_for_function(f"({condition}) ? performance.now() : null", timeout=timeout).json_value()
+
+    rounds = []
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch()
+        page = browser.new_page()
+        page.add_init_script(_BENCH_INIT_SCRIPT)
+        transferred = [0]
+
+        def count(size: int):
+            transferred[0] += size
+
+        def on_socket(ws):
+            ws.on("framereceived", lambda payload: count(len(payload)))
+            ws.on("framesent", lambda payload: count(len(payload)))
+
+        page.on("requestfinished", lambda request: count(sum(request.sizes()[k] for k in ("responseBodySize", "responseHeadersSize"))))
+        page.on("websocket", on_socket)
+        page.goto(url)
+        start = page.get_by_text("START VAR REVIEW")
+        start.wait_for()
+        page.wait_for_load_state("networkidle")
+
+        for _ in range(games):
+            before = transferred[0]
+            page.evaluate("window.__varBench.length = 0")
+            tapped = page.evaluate("performance.now()")
+            start.click()
+            playing = wait_for("window.__varBench.some(([type]) => type === 'playing')")
+            offset = page.evaluate("window.__varBench.find(([type]) => type === 'playing')[2]")
+            frozen = wait_for(_FREEZE_READY)
+            ended = page.evaluate("(window.__varBench.find(([type]) => type === 'ended') || [0, 0])[1]")
+            clicked = page.evaluate("performance.now()")
+            page.locator(f"#{FRAME_ID}").click()
+            result = wait_for("document.body.innerText.includes('ACCURACY - ')")
+            wait_for("document.body.innerText.includes('ANALYSIS COMPLETE')")
+            page.get_by_text("RETRY CHALLENGE").click()
+            start.wait_for()
+            page.wait_for_load_state("networkidle")
+            rounds.append({
+                "tap_to_first_frame_ms": playing - tapped,
+                "start_offset_s": offset,
+                "ended_to_freeze_ms": frozen - ended if ended else None,
+                "click_to_result_ms": result - clicked,
+                "bytes": transferred[0] - before,
+            })
+        browser.close()
+    return rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark replay transitions and bytes per game in a browser.")
+    parser.add_argument("--bench", metavar="URL", required=True, help="Frontend URL of a running app")
+    parser.add_argument("--games", type=int, default=10)
+    args = parser.parse_args()
+
+    rounds = bench(args.bench, args.games)
+    for index, row in enumerate(rounds, 1):
+        print(f"[PLAYBACK] game {index}: {row}")
+    for key in rounds[0]:
+        values = [row[key] for row in rounds if row[key] is not None]
+        if values:
+            print(f"[PLAYBACK] {key}: median {statistics.median(values):.3f}  max {max(values):.3f}")
+
+
+if __name__ == "__main__":
+    main()
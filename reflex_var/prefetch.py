@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import time
+
+from .catalog import clutch_catalog
+from .grid_service import GridService
+from .settings import Setting
+
+logger = logging.getLogger(__name__)
+
+
+class ClutchPrefetcher:
+    """
+    Keeps a bounded queue of picked clutch records (telemetry, target and
+    frame id) so START VAR REVIEW never waits on GRID. Runs as an app
+    lifespan task; the queue refills in the background as kiosks consume
+    records. Media URLs are resolved on pop, not on refill: a record can sit
+    in the queue since startup, before the media cache has downloaded its clip.
+    """
+
+    size = Setting("clutch_prefetch_size", 4, int)
+
+    def __init__(self, size: int | None = None):
+        self._size = size
+        self._queue: asyncio.Queue | None = None
+        self.last_refill_latency: float = 0.0
+        self.total_refill_latency: float = 0.0
+        self.refills: int = 0
+        self.skipped: int = 0
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.size)
+        return self._queue
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    @property
+    def avg_refill_latency(self) -> float:
+        return self.total_refill_latency / self.refills if self.refills else 0.0
+
+    def pop(self, session: str | None = None) -> dict | None:
+        """
+        Take the next record, resolved for playback, or None if the queue has
+        run dry. A record the session has seen recently is put back for
+        another kiosk instead.
+        """
+        try:
+            record = self.queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+        if session:
+            if clutch_catalog.recently_served(session, record["clip_id"]):
+                self.skipped += 1
+                try:
+                    self.queue.put_nowait(record)
+                except asyncio.QueueFull:
+                    pass
+                return None
+            clutch_catalog.mark_served(session, record["clip_id"])
+        return GridService.resolve_clutch(record)
+
+    def stats(self) -> dict:
+        return {
+            "depth": self.depth,
+            "size": self.size,
+            "refills": self.refills,
+            "skipped": self.skipped,
+            "last_refill_latency": self.last_refill_latency,
+            "avg_refill_latency": self.avg_refill_latency,
+        }
+
+    async def refill_once(self):
+        started = time.perf_counter()
+        record = GridService.pick_clutch()
+        self.last_refill_latency = time.perf_counter() - started
+        self.total_refill_latency += self.last_refill_latency
+        self.refills += 1
+        # Blocks while the queue is full, which throttles the refill loop.
+        await self.queue.put(record)
+
+    async def run(self):
+        """Lifespan task: keep the queue topped up until the app shuts down."""
+        while True:
+            try:
+                await self.refill_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("clutch prefetch failed: %s", e)
+                await asyncio.sleep(1)
+
+
+clutch_prefetcher = ClutchPrefetcher()
@@ -0,0 +1,123 @@
+"""
+On-demand sampling profiler for the running backend.
+
+    curl -H "Authorization: Bearer $REFLEX_VAR_ADMIN_TOKEN" \\
+        "http://localhost:8000/admin/profile?seconds=10&format=speedscope" > profile.json
+
+A sampler thread reads every other thread's Python stack with
+sys._current_frames() at a fixed interval for a bounded time, so event
+handlers, GRID calls and DB work on the event loop (and worker threads) show
+up as they run. Nothing is installed while no session is active. Output is
+collapsed stacks (flamegraph.pl, speedscope) or speedscope's JSON format.
+"""
+
+import hmac
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from .settings import setting
+
+MAX_SECONDS = 60.0
+MIN_INTERVAL = 0.001
+
+
+class SamplingProfiler:
+    """One bounded profiling session at a time; idle costs nothing."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sessions = 0
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    @staticmethod
+    def _frame_name(frame) -> str:
+        code = frame.f_code
+        name = getattr(code, "co_qualname", code.co_name)
+        return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def sample(self, seconds: float, interval: float) -> tuple[Counter, int]:
+        """
+        Collapsed stacks (root;...;leaf -> samples) and the number of ticks.
+        Blocks for `seconds`; run it off the event loop. Raises RuntimeError
+        if a session is already running.
+        """
+        seconds = min(max(seconds, interval), MAX_SECONDS)
+        interval = max(interval, MIN_INTERVAL)
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("a profiling session is already running")
+        try:
+            self.sessions += 1
+            me = threading.get_ident()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            stacks: Counter = Counter()
+            ticks = 0
+            deadline = time.perf_counter() + seconds
+            while time.perf_counter() < deadline:
+                for ident, frame in sys._current_frames().items():
+                    if ident == me:
+                        continue
+                    stack = []
+                    while frame is not None:
+                        stack.append(self._frame_name(frame))
+                        frame = frame.f_back
+                    stack.append(names.get(ident, f"thread-{ident}"))
+                    stacks[";".join(reversed(stack))] += 1
+                ticks += 1
+                time.sleep(interval)
+            return stacks, ticks
+        finally:
+            self._lock.release()
+
+    def stats(self) -> dict:
+        return {"busy": self.busy, "sessions": self.sessions}
+
+    @staticmethod
+    def collapsed(stacks: Counter) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+    @staticmethod
+    def speedscope(stacks: Counter, interval: float, name: str = "reflex_var backend") -> dict:
+        """Speedscope "sampled" profile; each sample weighs one interval."""
+        frames: list[dict] = []
+        index: dict[str, int] = {}
+        samples, weights = [], []
+        for stack, count in stacks.items():
+            ids = []
+            for frame in stack.split(";"):
+                if frame not in index:
+                    index[frame] = len(frames)
+                    frames.append({"name": frame})
+                ids.append(index[frame])
+            samples.append(ids)
+            weights.append(count * interval * 1000)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+            "exporter": "reflex_var.profiler",
+        }
+
+
+sampling_profiler = SamplingProfiler()
+
+
+def admin_authorized(header: str | None) -> bool:
+    """Bearer token check against admin_token; the admin routes are off while it is unset."""
+    token = setting("admin_token")
+    if not token or not header or not header.startswith("Bearer "):
+        return False
+    return hmac.compare_digest(header[len("Bearer "):].encode(), str(token).encode())
@@ -1,7 +1,22 @@
 """Welcome to Reflex! This file outlines the steps to create a basic app."""
 
+import logging
+
 import reflex as rx
-from .state import GameState, GamePhase
+from reflex.utils.format import format_queue_events
+from .state import GameState, GamePhase, InputState, LeaderboardState, ResultState, TelemetryState
+from .grid_client import grid_client_lifespan
+from . import fonts
+from .catalog import clutch_catalog
+from .grid_sync import grid_sync
+from .media_cache import media_cache
+from .playback import FIRST_FRAME_SCRIPT, FRAME_ID, RESULT_RENDER_SCRIPT, TAP_MARK_SCRIPT, freeze_script
+from .prefetch import clutch_prefetcher
+from .leaderboard import leaderboard_broadcaster
+from .score_writer import score_writer
+from .share_qr import route_url
+from .stills import still_index
+from .api import api
 
 # Constants for colors based on guidelines
 COLOR_BACKGROUND = "#0B0E11"
@@ -11,6 +26,34 @@ COLOR_SECONDARY = "#7B61FF"
 COLOR_SUCCESS = "#00FF94"
 COLOR_CRITICAL = "#FF4D00"
 
+# The VAR_FREEZE frame scores the click in the browser: position in the
+# video's own coordinates (the space targets are in, on any screen size) and a
+# provisional accuracy from the published target and slope. The server
+# recomputes it before it can be submitted.
+POINTER_SCRIPT = (
+    "document.addEventListener('pointerdown', (e) => { window.__varPointer = [e.clientX, e.clientY, performance.now()]; }, true);"
+)
+# The player uses object-fit: cover, so the frame is scaled to fill the box and
+# the overflow cropped evenly on both sides; undo that before normalizing.
+HIT_SCRIPT = f"""(() => {{
+    const frame = document.getElementById('{FRAME_ID}');
+    const video = frame.querySelector('video');
+    const rect = (video || frame).getBoundingClientRect();
+    const scale = video && video.videoWidth
+        ? Math.max(rect.width / video.videoWidth, rect.height / video.videoHeight) : 0;
+    const width = scale ? video.videoWidth * scale : rect.width;
+    const height = scale ? video.videoHeight * scale : rect.height;
+    const left = rect.left + (rect.width - width) / 2;
+    const top = rect.top + (rect.height - height) / 2;
+    const [px, py, pressedAt] = window.__varPointer || [left + width / 2, top + height / 2];
+    window.__varClickAt = pressedAt || performance.now();
+    const x = Math.min(1, Math.max(0, (px - left) / width));
+    const y = Math.min(1, Math.max(0, (py - top) / height));
+    const d = frame.dataset;
+    const distance = Math.hypot(x - Number(d.targetX), y - Number(d.targetY));
+    return {{x, y, accuracy: Math.max(0, 100 - distance * Number(d.slope))}};
+}})()"""
+
 def header() -> rx.Component:
     return rx.box(
         rx.hstack(
@@ -53,12 +96,12 @@ def footer() -> rx.Component:
         rx.hstack(
             rx.hstack(
                 rx.text("FRAME_ID:", color=COLOR_PRIMARY, font_family="JetBrains Mono", size="1", font_weight="bold"),
-                rx.text(GameState.frame_id, color="white", opacity=0.6, font_family="JetBrains Mono", size="1"),
+                rx.text(TelemetryState.frame_id, color="white", opacity=0.6, font_family="JetBrains Mono", size="1"),
                 spacing="2",
             ),
             rx.hstack(
                 rx.text("SMPTE:", color=COLOR_PRIMARY, font_family="JetBrains Mono", size="1", font_weight="bold"),
-                rx.text(GameState.timestamp, color="white", font_family="JetBrains Mono", size="1"),
+                rx.text(TelemetryState.timestamp, color="white", font_family="JetBrains Mono", size="1"),
                 spacing="2",
             ),
             rx.spacer(),
@@ -97,7 +140,7 @@ def idle_view() -> rx.Component:
                         rx.text("START VAR REVIEW"),
                         align="center",
                     ),
-                    on_click=GameState.start_var_review,
+                    on_click=GameState.start_var_review.stop_propagation,
                     background_color=COLOR_PRIMARY,
                     color=COLOR_BACKGROUND,
                     padding="32px 64px",
@@ -135,183 +178,244 @@ def idle_view() -> rx.Component:
             align="center",
             spacing="4",
         ),
+        # Warm the next clip's poster (hidden copy of the result still) too.
+        rx.cond(TelemetryState.still_url != "", rx.box(freeze_frame(sizes="50vw"), display="none")),
         on_click=GameState.start_var_review,
+        on_mount=GameState.prepare_next_clip,
         height="100vh",
         width="100vw",
         background="radial-gradient(circle, #161B22 0%, #0B0E11 100%)",
         cursor="pointer",
     )
 
-def playing_view() -> rx.Component:
-    return rx.center(
-        rx.vstack(
-            rx.heading("REPLAYING ACTION...", color=COLOR_PRIMARY, font_family="JetBrains Mono"),
-            rx.cond(
-                GameState.phase == GamePhase.PLAYING,
-                rx.video(
-                    src=GameState.video_url,
-                    playing=True,
-                    muted=True,
-                    controls=False,
-                    plays_inline=True,
-                    width="100%",
-                    height="auto",
-                    max_width="1000px",
-                    border_radius="12px",
-                    border=f"2px solid {COLOR_PRIMARY}",
-                    style={"pointer-events": "none"},
+def freeze_frame(sizes: str, **props) -> rx.Component:
+    """
+    The clip's event frame: the precomputed still (WebP with JPEG fallback,
+    browser picks the width) or, until the stills job has run, the paused video.
+    """
+    style = {"object-fit": "cover", "pointer-events": "none"}
+    return rx.cond(
+        TelemetryState.still_url != "",
+        rx.el.picture(
+            rx.el.source(type="image/webp", src_set=TelemetryState.still_webp_srcset, sizes=sizes),
+            rx.el.img(
+                src=TelemetryState.still_url,
+                src_set=TelemetryState.still_srcset,
+                sizes=sizes,
+                alt=TelemetryState.match_name,
+                decoding="async",
+                width="100%",
+                height="100%",
+                style={**style, "width": "100%", "height": "100%"},
+                **props,
+            ),
+            display="contents",
+        ),
+        rx.video(
+            src=TelemetryState.video_url,
+            playing=False,
+            muted=True,
+            controls=False,
+            plays_inline=True,
+            width="100%",
+            height="100%",
+            style=style,
+            **props,
+        ),
+    )
+
+def replay_player() -> rx.Component:
+    """
+    The one replay <video>. It stays mounted for the whole session: it plays
+    during PLAYING and pauses in place for VAR_FREEZE instead of being torn
+    down and re-created (and re-buffered) by each phase's view.
+    """
+    return rx.video(
+        src=TelemetryState.video_url,
+        playing=GameState.phase == GamePhase.PLAYING,
+        muted=True,
+        controls=False,
+        plays_inline=True,
+        # Also while hidden on IDLE: prepare_next_clip points src at the next
+        # clip so its first seconds are buffered before the START tap.
+        custom_attrs={"preload": "auto", "data-freeze-at": TelemetryState.freeze_at},
+        on_playing=rx.call_script(FIRST_FRAME_SCRIPT, callback=GameState.record_first_frame),
+        on_time_update=rx.call_script(freeze_script(str(format_queue_events(GameState.trigger_freeze)))),
+        # Media shorter than the clip metadata says.
+        on_ended=GameState.trigger_freeze,
+        width="100%",
+        height=rx.cond(GameState.phase == GamePhase.VAR_FREEZE, "100%", "auto"),
+        style={"object-fit": "cover", "pointer-events": "none"},
+    )
+
+def freeze_overlays() -> rx.Component:
+    return rx.fragment(
+        # Dynamic Scan Line
+        rx.box(
+            width="100%",
+            height="2px",
+            background=f"linear-gradient(to right, transparent, {COLOR_SECONDARY}, transparent)",
+            position="absolute",
+            top="0",
+            left="0",
+            z_index="5",
+            # Inline keyframes for better compatibility
+            style={
+                "@keyframes scan": {
+                    "0%": {"top": "0%"},
+                    "100%": {"top": "100%"},
+                },
+                "animation": "scan 3s linear infinite",
+            },
+            pointer_events="none",
+        ),
+        # Glassmorphism Scanning Overlay
+        rx.box(
+            rx.text(
+                "SCANNING PLAY... SELECT TARGET",
+                color="white",
+                font_family="JetBrains Mono",
+                font_size="24px",
+                font_weight="bold",
+                letter_spacing="0.4em",
+                animation="pulse 1.5s infinite",
+                margin_bottom="8px",
+            ),
+            rx.text(
+                "CLICK ON THE AGENT'S POSITION TO ANALYZE",
+                color=COLOR_PRIMARY,
+                font_family="JetBrains Mono",
+                font_size="12px",
+                font_weight="bold",
+                letter_spacing="0.2em",
+                text_align="center",
+            ),
+            position="absolute",
+            top="50%",
+            left="50%",
+            transform="translate(-50%, -50%)",
+            padding="24px 40px",
+            background_color="rgba(22, 27, 34, 0.6)",
+            backdrop_filter="blur(12px)",
+            border=f"1px solid {COLOR_SECONDARY}80",
+            border_radius="12px",
+            pointer_events="none",
+        ),
+        # UI Elements for Progress
+        rx.box(
+            rx.hstack(
+                rx.text("AI SCANNING PROGRESS", color=COLOR_SECONDARY, font_size="10px", font_weight="bold", letter_spacing="0.1em"),
+                rx.spacer(),
+                rx.text("88%", color=COLOR_SECONDARY, font_family="JetBrains Mono", font_size="10px"),
+                width="100%",
+                margin_bottom="8px",
+            ),
+            rx.box(
+                rx.box(
+                    width="88%",
+                    height="100%",
+                    background_color=COLOR_SECONDARY,
+                    border_radius="full",
                 ),
+                width="100%",
+                height="6px",
+                background_color="rgba(255, 255, 255, 0.1)",
+                border_radius="full",
             ),
-            spacing="4",
+            rx.text("CALCULATING PLAYER TRAJECTORIES...", color="white", opacity=0.5, font_size="10px", font_family="JetBrains Mono", font_style="italic", margin_top="8px"),
+            position="absolute",
+            bottom="10%",
+            left="50%",
+            transform="translateX(-50%)",
+            width="384px",
+            background_color="rgba(22, 27, 34, 0.6)",
+            backdrop_filter="blur(12px)",
+            padding="16px",
+            border_radius="12px",
+            border="1px solid rgba(255, 255, 255, 0.1)",
+            pointer_events="none",
         ),
-        height="100vh",
-        background_color=COLOR_BACKGROUND,
     )
 
-def var_freeze_view() -> rx.Component:
+def replay_view() -> rx.Component:
+    """
+    PLAYING and VAR_FREEZE share this view so the player is never unmounted;
+    only the frame styling and overlays change with the phase. Hidden in the
+    other phases so the next round reuses the same element.
+    """
+    playing = GameState.phase == GamePhase.PLAYING
+    freeze = GameState.phase == GamePhase.VAR_FREEZE
     return rx.box(
-        header(),
+        rx.cond(freeze, header()),
         rx.center(
-            rx.box(
-                # The "Video" Frame (frozen at the end of the replay)
+            rx.vstack(
+                rx.cond(
+                    playing,
+                    rx.heading("REPLAYING ACTION...", color=COLOR_PRIMARY, font_family="JetBrains Mono"),
+                ),
                 rx.box(
-                    rx.cond(
-                        GameState.phase == GamePhase.VAR_FREEZE,
-                        rx.video(
-                            src=GameState.video_url,
-                            playing=False,
-                            muted=True,
-                            controls=False,
-                            plays_inline=True,
-                            width="100%",
-                            height="100%",
-                            style={"object-fit": "cover", "pointer-events": "none"},
-                        ),
-                    ),
-                    width="92vw",
-                    height="78vh",
+                    replay_player(),
+                    rx.cond(freeze, freeze_overlays()),
+                    width=rx.cond(freeze, "92vw", "min(1000px, 92vw)"),
+                    height=rx.cond(freeze, "78vh", "auto"),
                     border_radius="12px",
-                    border=f"4px solid {COLOR_SECONDARY}",
-                    box_shadow=f"0 0 20px {COLOR_SECONDARY}66",
+                    border=rx.cond(freeze, f"4px solid {COLOR_SECONDARY}", f"2px solid {COLOR_PRIMARY}"),
+                    box_shadow=rx.cond(freeze, f"0 0 20px {COLOR_SECONDARY}66", "none"),
                     overflow="hidden",
                     position="relative",
-                    on_click=GameState.handle_click,
-                ),
-                # Dynamic Scan Line
-                rx.box(
-                    width="100%",
-                    height="2px",
-                    background=f"linear-gradient(to right, transparent, {COLOR_SECONDARY}, transparent)",
-                    position="absolute",
-                    top="0",
-                    left="0",
-                    z_index="5",
-                    # Inline keyframes for better compatibility
-                    style={
-                        "@keyframes scan": {
-                            "0%": {"top": "0%"},
-                            "100%": {"top": "100%"},
-                        },
-                        "animation": "scan 3s linear infinite",
+                    # Only the frozen frame takes clicks; clicks during the replay
+                    # would otherwise reach handle_click and trip its debounce.
+                    pointer_events=rx.cond(freeze, "auto", "none"),
+                    id=FRAME_ID,
+                    custom_attrs={
+                        "data-target-x": ResultState.target_x,
+                        "data-target-y": ResultState.target_y,
+                        "data-slope": ResultState.score_slope,
                     },
-                    pointer_events="none",
-                ),
-                # Glassmorphism Scanning Overlay
-                rx.box(
-                    rx.text(
-                        "SCANNING PLAY... SELECT TARGET",
-                        color="white",
-                        font_family="JetBrains Mono",
-                        font_size="24px",
-                        font_weight="bold",
-                        letter_spacing="0.4em",
-                        animation="pulse 1.5s infinite",
-                        margin_bottom="8px",
-                    ),
-                    rx.text(
-                        "CLICK ON THE AGENT'S POSITION TO ANALYZE",
-                        color=COLOR_PRIMARY,
-                        font_family="JetBrains Mono",
-                        font_size="12px",
-                        font_weight="bold",
-                        letter_spacing="0.2em",
-                        text_align="center",
-                    ),
-                    position="absolute",
-                    top="50%",
-                    left="50%",
-                    transform="translate(-50%, -50%)",
-                    padding="24px 40px",
-                    background_color="rgba(22, 27, 34, 0.6)",
-                    backdrop_filter="blur(12px)",
-                    border=f"1px solid {COLOR_SECONDARY}80",
-                    border_radius="12px",
-                    pointer_events="none",
-                ),
-                # UI Elements for Progress
-                rx.box(
-                    rx.hstack(
-                        rx.text("AI SCANNING PROGRESS", color=COLOR_SECONDARY, font_size="10px", font_weight="bold", letter_spacing="0.1em"),
-                        rx.spacer(),
-                        rx.text("88%", color=COLOR_SECONDARY, font_family="JetBrains Mono", font_size="10px"),
-                        width="100%",
-                        margin_bottom="8px",
-                    ),
-                    rx.box(
-                        rx.box(
-                            width="88%",
-                            height="100%",
-                            background_color=COLOR_SECONDARY,
-                            border_radius="full",
-                        ),
-                        width="100%",
-                        height="6px",
-                        background_color="rgba(255, 255, 255, 0.1)",
-                        border_radius="full",
-                    ),
-                    rx.text("CALCULATING PLAYER TRAJECTORIES...", color="white", opacity=0.5, font_size="10px", font_family="JetBrains Mono", font_style="italic", margin_top="8px"),
-                    position="absolute",
-                    bottom="10%",
-                    left="50%",
-                    transform="translateX(-50%)",
-                    width="384px",
-                    background_color="rgba(22, 27, 34, 0.6)",
-                    backdrop_filter="blur(12px)",
-                    padding="16px",
-                    border_radius="12px",
-                    border="1px solid rgba(255, 255, 255, 0.1)",
-                    pointer_events="none",
+                    on_click=rx.call_script(HIT_SCRIPT, callback=ResultState.handle_click),
                 ),
-                position="relative",
-            )
+                spacing="4",
+                align="center",
+            ),
+            height=rx.cond(freeze, "auto", "100vh"),
         ),
-        footer(),
+        rx.cond(freeze, footer()),
+        display=rx.cond(playing | freeze, "block", "none"),
         height="100vh",
         width="100vw",
         background_color=COLOR_BACKGROUND,
-        padding_top="80px",
+        padding_top=rx.cond(freeze, "80px", "0"),
     )
 
 def result_view() -> rx.Component:
+    share_qr_route = route_url("svg")
     return rx.box(
         header(),
         rx.hstack(
             # Left: Analysis Result
             rx.vstack(
                 rx.vstack(
-                    rx.text(f"MATCH: {GameState.match_name}", color=COLOR_PRIMARY, size="1", font_family="JetBrains Mono", letter_spacing="0.1em"),
-                    rx.text("STATUS: ANALYSIS COMPLETE", color=COLOR_SUCCESS, size="1", font_weight="bold", letter_spacing="0.3em"),
+                    rx.text(f"MATCH: {TelemetryState.match_name}", color=COLOR_PRIMARY, size="1", font_family="JetBrains Mono", letter_spacing="0.1em"),
+                    rx.cond(
+                        ResultState.score_verified,
+                        rx.text("STATUS: ANALYSIS COMPLETE", color=COLOR_SUCCESS, size="1", font_weight="bold", letter_spacing="0.3em"),
+                        rx.text("STATUS: VERIFYING", color=COLOR_PRIMARY, size="1", font_weight="bold", letter_spacing="0.3em"),
+                    ),
                     rx.heading(
                         "ACCURACY - ",
-                        rx.text.span(f"{GameState.accuracy}%", color=COLOR_PRIMARY),
+                        rx.text.span(f"{ResultState.accuracy}%", color=COLOR_PRIMARY),
                         size="9",
                         font_weight="black",
                         color="white",
                     ),
                     rx.cond(
-                        GameState.is_live,
+                        TelemetryState.is_live,
                         rx.badge("LIVE GRID TELEMETRY", color_scheme="green", variant="solid", margin_top="8px"),
-                        rx.badge("LOCAL DATA FALLBACK", color_scheme="gray", variant="outline", margin_top="8px"),
+                        rx.cond(
+                            TelemetryState.grid_circuit == "CLOSED",
+                            rx.badge("LOCAL DATA FALLBACK", color_scheme="gray", variant="outline", margin_top="8px"),
+                            rx.badge("GRID OFFLINE // LOCAL DATA", color_scheme="orange", variant="outline", margin_top="8px"),
+                        ),
                     ),
                     align_items="start",
                     spacing="1",
@@ -330,8 +434,8 @@ def result_view() -> rx.Component:
                                 background_color=f"{COLOR_SUCCESS}33",
                             ),
                             position="absolute",
-                            left=f"{GameState.target_x * 100}%",
-                            top=f"{GameState.target_y * 100}%",
+                            left=f"{ResultState.target_x * 100}%",
+                            top=f"{ResultState.target_y * 100}%",
                             transform="translate(-50%, -50%)",
                             display="flex",
                             align_items="center",
@@ -349,8 +453,8 @@ def result_view() -> rx.Component:
                                 background_color=f"{COLOR_PRIMARY}33",
                             ),
                             position="absolute",
-                            left=f"{GameState.user_x * 100}%",
-                            top=f"{GameState.user_y * 100}%",
+                            left=f"{ResultState.user_x * 100}%",
+                            top=f"{ResultState.user_y * 100}%",
                             transform="translate(-50%, -50%)",
                             display="flex",
                             align_items="center",
@@ -360,17 +464,7 @@ def result_view() -> rx.Component:
                         # Background Video (Static Frame)
                         rx.cond(
                             GameState.phase == GamePhase.RESULT,
-                            rx.video(
-                                src=GameState.video_url,
-                                playing=False,
-                                muted=True,
-                                controls=False,
-                                plays_inline=True,
-                                width="100%",
-                                height="100%",
-                                opacity=0.8,
-                                style={"object-fit": "cover", "pointer-events": "none"},
-                            ),
+                            freeze_frame(sizes="50vw", opacity=0.8),
                         ),
                         width="100%",
                         height="100%",
@@ -401,9 +495,9 @@ def result_view() -> rx.Component:
                             ),
                             rx.text(
                                 rx.cond(
-                                    GameState.accuracy > 90,
-                                    f"World-Class performance during {GameState.match_name}! Your spatial awareness matches {GameState.player_name}'s data point exactly.",
-                                    f"Good attempt on {GameState.player_name}'s play. You were slightly off the target coordinate in the {GameState.match_name} analysis."
+                                    ResultState.accuracy > 90,
+                                    f"World-Class performance during {TelemetryState.match_name}! Your spatial awareness matches {TelemetryState.player_name}'s data point exactly.",
+                                    f"Good attempt on {TelemetryState.player_name}'s play. You were slightly off the target coordinate in the {TelemetryState.match_name} analysis."
                                 ),
                                 color="white",
                                 opacity=0.7,
@@ -421,42 +515,65 @@ def result_view() -> rx.Component:
                     margin_top="24px",
                     width="100%",
                 ),
-                # Initials Input for Leaderboard
-                rx.vstack(
-                    rx.text("ENTER INITIALS TO SAVE SCORE", color="white", size="1", font_weight="bold", opacity=0.6),
-                    rx.input(
-                        placeholder="C9J",
-                        value=GameState.user_initials,
-                        on_change=GameState.set_user_initials,
-                        max_length=3,
-                        text_align="center",
-                        font_family="JetBrains Mono",
+                # Initials Input for Leaderboard. Uncontrolled: the browser
+                # uppercases and caps the entry, and the value reaches the
+                # server on blur (for the share QR) and on submit, not per keystroke.
+                rx.form(
+                    rx.vstack(
+                        rx.text("ENTER INITIALS TO SAVE SCORE", color="white", size="1", font_weight="bold", opacity=0.6),
+                        rx.input(
+                            name="initials",
+                            placeholder="C9J",
+                            default_value=InputState.user_initials,
+                            on_blur=InputState.set_user_initials,
+                            max_length=3,
+                            auto_complete=False,
+                            text_align="center",
+                            font_family="JetBrains Mono",
+                            font_weight="bold",
+                            font_size="24px",
+                            background_color=COLOR_SURFACE,
+                            border=f"1px solid {COLOR_SURFACE}",
+                            color=COLOR_PRIMARY,
+                            width="120px",
+                            style={"text-transform": "uppercase"},
+                        ),
+                        align_items="start",
+                        margin_top="24px",
+                        spacing="2",
+                    ),
+                    rx.button(
+                        "SUBMIT SCORE",
+                        type="submit",
+                        # The server re-checks the browser's provisional score first.
+                        loading=~ResultState.score_verified,
+                        background_color=COLOR_SUCCESS,
+                        color=COLOR_BACKGROUND,
+                        width="100%",
+                        margin_top="12px",
                         font_weight="bold",
-                        font_size="24px",
-                        background_color=COLOR_SURFACE,
-                        border=f"1px solid {COLOR_SURFACE}",
-                        color=COLOR_PRIMARY,
-                        width="120px",
                     ),
-                    align_items="start",
-                    margin_top="24px",
-                    spacing="2",
-                ),
-                rx.button(
-                    "SUBMIT SCORE",
-                    on_click=GameState.submit_score,
-                    background_color=COLOR_SUCCESS,
-                    color=COLOR_BACKGROUND,
+                    on_submit=InputState.submit_score,
                     width="100%",
-                    margin_top="12px",
-                    font_weight="bold",
+                ),
+                rx.cond(
+                    ResultState.user_rank > 0,
+                    rx.text(
+                        f"YOUR RANK: #{ResultState.user_rank}",
+                        color=COLOR_SUCCESS,
+                        font_family="JetBrains Mono",
+                        font_weight="bold",
+                        size="2",
+                        letter_spacing="0.2em",
+                        margin_top="8px",
+                    ),
                 ),
                 # Option D: QR Code Share
                 rx.vstack(
                     rx.text("SCAN TO TAKE SCORE HOME", color="white", size="1", font_weight="bold", opacity=0.6),
                     rx.box(
                         rx.image(
-                            src=f"https://api.qrserver.com/v1/create-qr-code/?size=150x150&data=https://reflex-var.com/share?score={GameState.accuracy}%26initials={GameState.user_initials}",
+                            src=f"{share_qr_route}?score={ResultState.accuracy}&initials={InputState.user_initials}",
                             width="120px",
                             height="120px",
                         ),
@@ -489,7 +606,7 @@ def result_view() -> rx.Component:
                     rx.box(height="1px", width="100%", background_color="white", opacity=0.1),
                     rx.vstack(
                         rx.foreach(
-                            GameState.leaderboard,
+                            LeaderboardState.rows,
                             lambda entry, index: rx.hstack(
                                 rx.text(index + 1),
                                 rx.text(entry.initials),
@@ -517,6 +634,7 @@ def result_view() -> rx.Component:
             padding_top="80px",
         ),
         footer(),
+        on_mount=rx.call_script(RESULT_RENDER_SCRIPT, callback=ResultState.record_result_render),
         height="100vh",
         background_color=COLOR_BACKGROUND,
     )
@@ -538,7 +656,7 @@ def leaderboard_view() -> rx.Component:
                     ),
                     rx.table.body(
                         rx.foreach(
-                            GameState.leaderboard,
+                            LeaderboardState.rows,
                             lambda entry, index: rx.table.row(
                                 rx.table.cell(index + 1),
                                 rx.table.cell(entry.initials),
@@ -564,11 +682,13 @@ def leaderboard_view() -> rx.Component:
 
 def index() -> rx.Component:
     return rx.box(
+        replay_view(),
         rx.match(
             GameState.phase,
             (GamePhase.IDLE, idle_view()),
-            (GamePhase.PLAYING, playing_view()),
-            (GamePhase.VAR_FREEZE, var_freeze_view()),
+            # The replay view below renders these two phases.
+            (GamePhase.PLAYING, rx.fragment()),
+            (GamePhase.VAR_FREEZE, rx.fragment()),
             (GamePhase.RESULT, result_view()),
             (GamePhase.LEADERBOARD, leaderboard_view()),
             idle_view(),
@@ -577,13 +697,26 @@ def index() -> rx.Component:
         min_height="100vh",
     )
 
+# Game event tracing goes through logging; REFLEX_VAR_LOG_LEVEL=DEBUG turns it on.
+logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logging.getLogger("reflex_var").setLevel(str(getattr(rx.config.get_config(), "log_level", "INFO")).upper())
+
 app = rx.App(
-    stylesheets=[
-        "https://fonts.googleapis.com/css2?family=JetBrains+Mono:wght@400;700;800&family=Noto+Sans:wght@400;500;700&display=swap",
-    ],
+    # Vendored fonts from assets/fonts when present (python -m reflex_var.fonts)
+    stylesheets=fonts.stylesheets(),
     theme=rx.theme(
         appearance="dark",
         has_background=True,
     ),
+    head_components=[*fonts.preload_links(), rx.script(TAP_MARK_SCRIPT), rx.script(POINTER_SCRIPT)],
+    api_transformer=api,
 )
-app.add_page(index)
+app.add_page(index, on_load=LeaderboardState.sync)
+app.register_lifespan_task(grid_client_lifespan)
+app.register_lifespan_task(clutch_catalog.lifespan)
+app.register_lifespan_task(still_index.lifespan)
+app.register_lifespan_task(clutch_prefetcher.run)
+app.register_lifespan_task(grid_sync.run)
+app.register_lifespan_task(media_cache.run)
+app.register_lifespan_task(leaderboard_broadcaster.run)
+app.register_lifespan_task(score_writer.lifespan)
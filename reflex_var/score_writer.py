@@ -0,0 +1,223 @@
+import asyncio
+import contextlib
+import json
+import logging
+import time
+from collections import deque
+
+import reflex as rx
+from sqlalchemy.exc import OperationalError
+
+from .metrics import db_seconds, timed
+from .settings import Setting
+
+logger = logging.getLogger(__name__)
+
+
+class ScoreWriter:
+    """
+    Write-behind group commit for leaderboard submissions.
+
+    submit() only enqueues and returns, so the event handler acknowledges the
+    score immediately. A background loop commits queued rows in a single
+    transaction every score_flush_interval_ms or as soon as score_batch_size
+    rows are waiting. The queue is drained on graceful shutdown.
+
+    Transient database errors (locked, disconnected) are retried with backoff,
+    and a batch that still fails goes back to the front of the queue for the
+    next flush, up to score_max_attempts flushes. After that, or straight
+    away for any other error, its rows are appended to the dead-letter file
+    and dropped, so one bad batch cannot block every later score. At most
+    score_max_pending rows wait in memory; overflow is dead-lettered too.
+    """
+
+    flush_interval = Setting("score_flush_interval_ms", 200, lambda ms: float(ms) / 1000)
+    batch_size = Setting("score_batch_size", 50, int)
+    max_retries = Setting("score_max_retries", 3, int)
+    max_attempts = Setting("score_max_attempts", 5, int)
+    max_pending = Setting("score_max_pending", 10_000, int)
+    dead_letter_path = Setting("score_dead_letter_path", "score_dead_letter.jsonl", str)
+
+    def __init__(
+        self,
+        flush_interval: float | None = None,
+        batch_size: int | None = None,
+        max_retries: int | None = None,
+        max_attempts: int | None = None,
+        max_pending: int | None = None,
+        dead_letter_path: str | None = None,
+    ):
+        self._flush_interval = flush_interval
+        self._batch_size = batch_size
+        self._max_retries = max_retries
+        self._max_attempts = max_attempts
+        self._max_pending = max_pending
+        self._dead_letter_path = dead_letter_path
+        self._pending: deque = deque()
+        # id(entry) -> flushes that failed with the entry in the batch
+        self._attempts: dict[int, int] = {}
+        self._wake: asyncio.Event | None = None
+        self._flush_lock: asyncio.Lock | None = None
+        self.commits = 0
+        self.rows_committed = 0
+        self.retries = 0
+        self.failures = 0
+        self.dead_lettered = 0
+        self.overflowed = 0
+        self.last_commit_latency = 0.0
+        self.total_commit_latency = 0.0
+
+    @property
+    def wake(self) -> asyncio.Event:
+        if self._wake is None:
+            self._wake = asyncio.Event()
+        return self._wake
+
+    @property
+    def flush_lock(self) -> asyncio.Lock:
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        return self._flush_lock
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def submit(self, entry):
+        """Queue a ScoreEntry for the next group commit."""
+        if len(self._pending) >= self.max_pending:
+            # The database has been failing for a while; keep the row, but on disk.
+            self.overflowed += 1
+            self._dead_letter([entry], "queue full")
+            return
+        self._pending.append(entry)
+        if len(self._pending) >= self.batch_size:
+            self.wake.set()
+
+    def pending_better(self, accuracy: float) -> int:
+        """Queued (not yet committed) scores strictly better than accuracy."""
+        return sum(1 for entry in self._pending if entry.accuracy > accuracy)
+
+    # OperationalError also covers schema problems ("no such column" before a
+    # migration), which no amount of retrying fixes.
+    _TRANSIENT_MARKERS = ("locked", "busy", "timeout", "timed out", "deadlock", "could not connect", "connection", "server closed")
+
+    @staticmethod
+    def _transient(error: Exception) -> bool:
+        if getattr(error, "connection_invalidated", False):
+            return True
+        if not isinstance(error, OperationalError):
+            return False
+        message = str(error.orig if error.orig is not None else error).lower()
+        return any(marker in message for marker in ScoreWriter._TRANSIENT_MARKERS)
+
+    def _dead_letter(self, batch: list, reason: str):
+        """Append rows that will not be committed to the dead-letter file (JSON lines)."""
+        self.dead_lettered += len(batch)
+        for entry in batch:
+            self._attempts.pop(id(entry), None)
+        lines = [json.dumps({"reason": reason, **entry.model_dump(exclude={"id"})}) for entry in batch]
+        try:
+            with open(self.dead_letter_path, "a") as f:
+                f.writelines(line + "\n" for line in lines)
+        except OSError as e:
+            logger.error("score dead-letter file %s not writable (%s); dropped rows: %s", self.dead_letter_path, e, lines)
+            return
+        logger.error("%d score rows moved to %s: %s", len(batch), self.dead_letter_path, reason)
+
+    @staticmethod
+    @timed(db_seconds, operation="score_commit")
+    async def _commit(batch: list):
+        # rx.asession keeps attributes readable after commit for the leaderboard update.
+        async with rx.asession() as asession:
+            asession.add_all(batch)
+            await asession.commit()
+
+    async def flush(self) -> int:
+        """Commit everything queued right now, one transaction per batch."""
+        from .leaderboard import leaderboard_broadcaster, leaderboard_cache
+
+        committed = 0
+        async with self.flush_lock:
+            while self._pending:
+                batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+                started = time.perf_counter()
+                for attempt in range(self.max_retries + 1):
+                    try:
+                        await self._commit(batch)
+                        error = None
+                        break
+                    except Exception as e:
+                        error = e
+                        if attempt < self.max_retries and self._transient(e):
+                            self.retries += 1
+                            await asyncio.sleep(0.05 * 2 ** attempt)
+                            continue
+                        break
+                    except BaseException:
+                        self._pending.extendleft(reversed(batch))
+                        raise
+                if error is not None:
+                    self.failures += 1
+                    attempts = 1 + max(self._attempts.get(id(entry), 0) for entry in batch)
+                    if self._transient(error) and attempts < self.max_attempts:
+                        logger.warning(
+                            "score commit failed (flush %d of %d), %d rows re-queued: %s",
+                            attempts, self.max_attempts, len(batch), error,
+                        )
+                        for entry in batch:
+                            self._attempts[id(entry)] = attempts
+                        self._pending.extendleft(reversed(batch))
+                        return committed
+                    self._dead_letter(batch, f"{type(error).__name__} after {attempts} flush(es): {error}")
+                    continue
+                for entry in batch:
+                    self._attempts.pop(id(entry), None)
+                self.last_commit_latency = time.perf_counter() - started
+                self.total_commit_latency += self.last_commit_latency
+                self.commits += 1
+                self.rows_committed += len(batch)
+                committed += len(batch)
+                if any([leaderboard_cache.add(entry) for entry in batch]):
+                    leaderboard_broadcaster.request_rebuild()
+        return committed
+
+    async def run(self):
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self.wake.wait(), timeout=self.flush_interval)
+            self.wake.clear()
+            try:
+                # Shielded so shutdown never abandons a batch mid-commit.
+                await asyncio.shield(self.flush())
+            except Exception as e:
+                logger.warning("score flush failed: %s", e)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self):
+        """Run the flush loop for the app's lifetime and drain the queue on shutdown."""
+        task = asyncio.create_task(self.run())
+        try:
+            yield
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+            await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "depth": self.depth,
+            "commits": self.commits,
+            "rows_committed": self.rows_committed,
+            "retries": self.retries,
+            "failures": self.failures,
+            "dead_lettered": self.dead_lettered,
+            "overflowed": self.overflowed,
+            "last_commit_latency": self.last_commit_latency,
+            "avg_commit_latency": self.total_commit_latency / self.commits if self.commits else 0.0,
+        }
+
+
+# handle_click only enqueues; the lifespan task owns the database writes.
+score_writer = ScoreWriter()
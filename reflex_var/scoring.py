@@ -0,0 +1,219 @@
+"""
+Vectorized scoring engine and historical re-scoring job.
+
+The rules come from rxconfig (scoring_default_slope, scoring_curves). After
+changing them, re-score every stored click with the new rules:
+
+    python -m reflex_var.scoring
+
+The job then asks the running backend (POST /admin/scoring/reload) to load
+the same rules for live scoring and to push the re-scored leaderboard.
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+from typing import Callable, Sequence
+
+import httpx
+import numpy as np
+import reflex as rx
+from sqlmodel import select
+
+# A tolerance curve maps an array of click-to-target distances (0-1 space)
+# to an array of accuracies in [0, 100].
+ToleranceCurve = Callable[[np.ndarray], np.ndarray]
+
+# Current kiosk rule: 0.05 distance is roughly 90% accuracy.
+DEFAULT_SLOPE = 200.0
+
+
+def linear_curve(slope: float = DEFAULT_SLOPE) -> ToleranceCurve:
+    """accuracy = max(0, 100 - distance * slope), the rule used by calculate_pro_accuracy."""
+    def curve(distance: np.ndarray) -> np.ndarray:
+        return np.maximum(0.0, 100.0 - distance * slope)
+    # Read by client_slope: kiosks can reproduce a linear rule in the browser.
+    curve.slope = slope
+    return curve
+
+
+def gaussian_curve(sigma: float) -> ToleranceCurve:
+    """Smooth falloff: full marks at the target, ~61% at one sigma."""
+    def curve(distance: np.ndarray) -> np.ndarray:
+        return 100.0 * np.exp(-0.5 * (distance / sigma) ** 2)
+    return curve
+
+
+class ScoringRules:
+    """Per-event-type tolerance curves with a default for unknown types."""
+
+    def __init__(self, default: ToleranceCurve | None = None, curves: dict[str, ToleranceCurve] | None = None):
+        self.default = default or linear_curve()
+        self.curves: dict[str, ToleranceCurve] = dict(curves or {})
+
+    @classmethod
+    def from_config(cls, config: rx.Config | None = None) -> "ScoringRules":
+        """
+        Rules from scoring_default_slope and scoring_curves, e.g.
+        {"VALORANT_PLANT": {"slope": 250}, "VALORANT_ABILITY": {"sigma": 0.08}}.
+        """
+        config = config or rx.config.get_config()
+        rules = cls(default=linear_curve(float(getattr(config, "scoring_default_slope", DEFAULT_SLOPE))))
+        for event_type, spec in (getattr(config, "scoring_curves", None) or {}).items():
+            if set(spec) == {"slope"}:
+                rules.register(event_type, linear_curve(float(spec["slope"])))
+            elif set(spec) == {"sigma"}:
+                rules.register(event_type, gaussian_curve(float(spec["sigma"])))
+            else:
+                raise ValueError(f"scoring_curves[{event_type!r}] needs exactly one of slope or sigma, got {spec!r}")
+        return rules
+
+    def register(self, event_type: str, curve: ToleranceCurve):
+        self.curves[event_type] = curve
+
+    def replace(self, rules: "ScoringRules"):
+        """Switch to another rule set in place, so every importer sees it."""
+        self.default, self.curves = rules.default, dict(rules.curves)
+
+    def client_slope(self, event_type: str | None) -> float:
+        """
+        Slope the browser uses for its provisional score. Non-linear curves
+        fall back to the default slope; the server's verified score is final.
+        """
+        curve = self.curves.get(event_type, self.default)
+        return float(getattr(curve, "slope", DEFAULT_SLOPE))
+
+    def score_batch(
+        self,
+        user: np.ndarray,
+        target: np.ndarray,
+        event_types: Sequence[str] | np.ndarray | None = None,
+    ) -> np.ndarray:
+        """
+        Score N clicks in one call. user and target are (N, 2) arrays of
+        normalized coordinates; event_types optionally selects a curve per row.
+        """
+        user = np.asarray(user, dtype=np.float64)
+        target = np.asarray(target, dtype=np.float64)
+        distance = np.hypot(user[:, 0] - target[:, 0], user[:, 1] - target[:, 1])
+
+        if event_types is None or not self.curves:
+            return self.default(distance)
+
+        event_types = np.asarray(event_types, dtype=object)
+        accuracy = np.empty_like(distance)
+        handled = np.zeros(distance.shape, dtype=bool)
+        for event_type, curve in self.curves.items():
+            mask = event_types == event_type
+            if mask.any():
+                accuracy[mask] = curve(distance[mask])
+                handled |= mask
+        if not handled.all():
+            accuracy[~handled] = self.default(distance[~handled])
+        return accuracy
+
+
+# Live scoring rules; the re-score job loads the same ones from rxconfig.
+default_rules = ScoringRules.from_config()
+
+# Provisional (browser) scores checked by the server: "verified" or "corrected".
+score_checks: Counter[str] = Counter()
+
+# Positional placeholders per DBAPI paramstyle (sqlite/aiosqlite, asyncpg, psycopg).
+_PLACEHOLDERS = {
+    "qmark": ("?", "?"),
+    "numeric_dollar": ("$1", "$2"),
+    "format": ("%s", "%s"),
+    "pyformat": ("%s", "%s"),
+}
+
+
+async def rescore_all(rules: ScoringRules, chunk_size: int = 50_000, progress: Callable[[int], None] | None = None) -> int:
+    """
+    Stream every stored click with coordinates through `rules`, rewrite its
+    accuracy in id-ordered chunks (keyset pagination, one bulk UPDATE per
+    chunk), then rebuild this process's leaderboard. Returns rows re-scored.
+    """
+    from .leaderboard import leaderboard_broadcaster, leaderboard_cache
+    from .state import ScoreEntry
+
+    last_id = 0
+    total = 0
+    while True:
+        async with rx.asession() as asession:
+            rows = (await asession.exec(
+                select(
+                    ScoreEntry.id, ScoreEntry.user_x, ScoreEntry.user_y,
+                    ScoreEntry.target_x, ScoreEntry.target_y, ScoreEntry.event_type,
+                )
+                .where(ScoreEntry.id > last_id, ScoreEntry.user_x.is_not(None))
+                .order_by(ScoreEntry.id)
+                .limit(chunk_size)
+            )).all()
+            if not rows:
+                break
+            ids, ux, uy, tx, ty, event_types = zip(*rows)
+            accuracy = np.round(rules.score_batch(
+                np.column_stack((ux, uy)), np.column_stack((tx, ty)), event_types,
+            ), 1)
+            # Driver-level executemany: per-row parameter handling in the ORM and
+            # Core layers would otherwise dominate a multi-million row job.
+            connection = await asession.connection()
+            accuracy_mark, id_mark = _PLACEHOLDERS[connection.dialect.paramstyle]
+            await connection.exec_driver_sql(
+                f"UPDATE {ScoreEntry.__tablename__} SET accuracy = {accuracy_mark} WHERE id = {id_mark}",
+                list(zip(accuracy.tolist(), ids)),
+            )
+            await asession.commit()
+        last_id = ids[-1]
+        total += len(ids)
+        if progress:
+            progress(total)
+
+    # Reload the top-K from the re-scored table and push it to connected kiosks
+    # (when run inside the backend; the CLI asks the backend via reload_backend).
+    leaderboard_cache.invalidate()
+    leaderboard_broadcaster.request_rebuild()
+    return total
+
+
+def reload_backend(config: rx.Config | None = None) -> dict:
+    """Ask the running backend to reload the scoring rules and its leaderboard."""
+    config = config or rx.config.get_config()
+    response = httpx.post(
+        f"{config.api_url.rstrip('/')}/admin/scoring/reload",
+        headers={"Authorization": f"Bearer {getattr(config, 'admin_token', None) or ''}"},
+        timeout=10,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Re-score stored VAR clicks with the scoring rules in rxconfig (scoring_default_slope, scoring_curves).",
+    )
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--no-reload", action="store_true",
+                        help="Do not ask the running backend to reload its rules and leaderboard")
+    args = parser.parse_args()
+
+    rules = ScoringRules.from_config()
+    started = time.perf_counter()
+    total = asyncio.run(rescore_all(
+        rules, args.chunk_size,
+        progress=lambda n: print(f"[RESCORE] {n} rows ({time.perf_counter() - started:.1f}s)"),
+    ))
+    print(f"[RESCORE] done: {total} rows in {time.perf_counter() - started:.1f}s")
+    if args.no_reload:
+        return
+    try:
+        print(f"[RESCORE] backend reloaded: {reload_backend()}")
+    except httpx.HTTPError as e:
+        # Restarting the backend loads the same rules and leaderboard.
+        print(f"[RESCORE] backend reload failed ({e}); restart it to pick up the new rules")
+
+
+if __name__ == "__main__":
+    main()
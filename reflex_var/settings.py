@@ -0,0 +1,45 @@
+"""
+Tuning knobs read from rxconfig.
+
+The backend services are module-level singletons built at import time,
+before the app config is loaded, so each knob is read lazily on first use
+unless the constructor was given an explicit value.
+"""
+from typing import Any, Callable
+
+import reflex as rx
+
+
+def setting(name: str, default: Any = None, cast: Callable[[Any], Any] | None = None) -> Any:
+    """The rxconfig value for name (default when unset), optionally passed through cast."""
+    value = getattr(rx.config.get_config(), name, default)
+    return value if cast is None or value is None else cast(value)
+
+
+class Setting:
+    """
+    Read-once attribute backed by rxconfig.
+
+    The value lives in the instance's `_<attr>` slot, so a constructor that
+    stores an explicit argument there (`self._ttl = ttl`) overrides the
+    config; None means "read rxconfig on first access". The config name may
+    refer to the instance, e.g. "{self.name}_breaker_cooldown".
+    """
+
+    def __init__(self, name: str, default: Any, cast: Callable[[Any], Any] = float):
+        self.name = name
+        self.default = default
+        self.cast = cast
+        self.slot = ""
+
+    def __set_name__(self, owner, attr: str):
+        self.slot = f"_{attr}"
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = instance.__dict__.get(self.slot)
+        if value is None:
+            value = setting(self.name.format(self=instance), self.default, self.cast)
+            instance.__dict__[self.slot] = value
+        return value
@@ -0,0 +1,148 @@
+"""
+Share-panel QR codes, rendered by the backend instead of a third-party
+QR service so the result screen works on an offline kiosk.
+
+    GET /qr/share.svg?score=87.5&initials=C9J
+
+Codes are keyed by (format, score, initials, share base URL) in a small LRU
+of rendered bytes and served with long-lived cache headers.
+
+    python -m reflex_var.share_qr --bench
+"""
+
+import argparse
+import asyncio
+import io
+import re
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+import reflex as rx
+from starlette.responses import Response
+
+from .settings import Setting
+
+try:
+    import segno
+    SEGNO_AVAILABLE = True
+except ImportError:
+    SEGNO_AVAILABLE = False
+
+MEDIA_TYPES = {"svg": "image/svg+xml", "png": "image/png"}
+
+_NOT_INITIAL = re.compile(r"[^A-Z0-9]")
+
+
+def normalize(score: float, initials: str) -> tuple[float, str]:
+    """The values a share link is built from: score to one decimal, A-Z/0-9 initials."""
+    return round(min(100.0, max(0.0, float(score))), 1), _NOT_INITIAL.sub("", initials.upper())[:3]
+
+
+def share_link(base_url: str, score: float, initials: str) -> str:
+    return f"{base_url}?{urlencode({'score': score, 'initials': initials})}"
+
+
+def route_url(kind: str = "svg") -> str:
+    """Backend URL of the share QR route; the UI appends score and initials."""
+    return f"{rx.config.get_config().api_url.rstrip('/')}/qr/share.{kind}"
+
+
+class ShareQRCache:
+    """LRU of rendered share QR codes, keyed by (kind, score, initials, base URL)."""
+
+    max_entries = Setting("qr_cache_max_entries", 256, int)
+    base_url = Setting("share_base_url", "https://reflex-var.com/share", str)
+
+    def __init__(self, max_entries: int | None = None, base_url: str | None = None):
+        self._max_entries = max_entries
+        self._base_url = base_url
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, bytes] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.render_seconds = 0.0
+
+    @staticmethod
+    def render(data: str, kind: str) -> bytes:
+        buffer = io.BytesIO()
+        qr = segno.make(data, error="m")
+        if kind == "svg":
+            qr.save(buffer, kind="svg", scale=4, border=2, xmldecl=False)
+        else:
+            qr.save(buffer, kind="png", scale=5, border=2)
+        return buffer.getvalue()
+
+    def get(self, kind: str, score: float, initials: str) -> bytes:
+        score, initials = normalize(score, initials)
+        key = (kind, score, initials, self.base_url)
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return body
+            self.misses += 1
+        started = time.perf_counter()
+        body = self.render(share_link(self.base_url, score, initials), kind)
+        with self._lock:
+            self.render_seconds += time.perf_counter() - started
+            self._entries[key] = body
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return body
+
+    async def response(self, kind: str, score: float, initials: str) -> Response:
+        key = (kind, *normalize(score, initials), self.base_url)
+        # Cache hits answer inline; a miss renders off the event loop.
+        if key in self._entries:
+            body = self.get(kind, score, initials)
+        else:
+            body = await asyncio.to_thread(self.get, kind, score, initials)
+        return Response(body, media_type=MEDIA_TYPES[kind], headers={"Cache-Control": "public, max-age=604800"})
+
+    def stats(self) -> dict:
+        return {
+            "available": SEGNO_AVAILABLE,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "avg_render_ms": self.render_seconds / self.misses * 1000 if self.misses else 0.0,
+        }
+
+
+share_qr_cache = ShareQRCache()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark share QR rendering and cache hits.")
+    parser.add_argument("--bench", action="store_true", help="Time renders (misses) against cache hits")
+    parser.add_argument("--count", type=int, default=500, help="Distinct codes to render")
+    args = parser.parse_args()
+    if not SEGNO_AVAILABLE:
+        raise SystemExit("[SHARE_QR] segno is not installed")
+    if not args.bench:
+        parser.print_help()
+        return
+
+    cache = ShareQRCache(max_entries=args.count, base_url="https://reflex-var.com/share")
+    for kind in MEDIA_TYPES:
+        keys = [(i / 10 % 100, f"A{i % 100:02d}") for i in range(args.count)]
+        started = time.perf_counter()
+        for score, initials in keys:
+            cache.get(kind, score, initials)
+        miss = (time.perf_counter() - started) / len(keys)
+        started = time.perf_counter()
+        for _ in range(10):
+            for score, initials in keys:
+                cache.get(kind, score, initials)
+        hit = (time.perf_counter() - started) / (10 * len(keys))
+        print(f"[SHARE_QR] {kind}: render {miss * 1e3:.3f} ms  hit {hit * 1e6:.2f} us  ({len(keys)} codes)")
+
+
+if __name__ == "__main__":
+    main()
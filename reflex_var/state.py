@@ -1,6 +1,24 @@
 import asyncio
+import logging
+import time
 import reflex as rx
 from enum import Enum
+from sqlmodel import Field
+
+from .catalog import DEFAULT_CLIP_DURATION
+from .events import single_flight
+from .leaderboard import LeaderboardRow, leaderboard_broadcaster, leaderboard_cache
+from .metrics import handler_seconds, phase_transition_seconds, timed
+from .playback import REWIND_SCRIPT, first_frame_stats
+from .scoring import DEFAULT_SLOPE, default_rules, score_checks
+from .score_writer import score_writer
+from .stills import event_offset
+
+logger = logging.getLogger(__name__)
+
+# Seconds past the clip's end before the server freezes a replay whose
+# browser never reported reaching the event frame.
+FREEZE_BACKSTOP_MARGIN = 3.0
 
 class GamePhase(Enum):
     IDLE = "IDLE"
@@ -12,124 +30,321 @@ class GamePhase(Enum):
 
 class ScoreEntry(rx.Model, table=True):
     initials: str
-    accuracy: float
+    accuracy: float = Field(index=True)
     timestamp: str
+    # Raw click and target, kept so scores can be recomputed when the rules change
+    user_x: float | None = None
+    user_y: float | None = None
+    target_x: float | None = None
+    target_y: float | None = None
+    event_type: str | None = None
 
 class GameState(rx.State):
+    """
+    Session and phase. Everything else a round needs lives in the substates
+    below, so an event only sends (and, with a redis state manager, only
+    loads) the substate it touches.
+    """
     phase: GamePhase = GamePhase.IDLE
-    
-    # User Input
-    user_initials: str = ""
-    
-    def set_user_initials(self, val: str):
-        self.user_initials = val.upper()[:3]
 
-    # GRID Data / Game Logic
-    target_x: float = 0.5
-    target_y: float = 0.5
-    user_x: float = 0.0
-    user_y: float = 0.0
-    accuracy: float = 0.0
-    
-    # Telemetry data for display
+    # Incremented per replay so a late timer from a previous round is ignored
+    _round: int = 0
+
+    # Clutch reserved for this kiosk's next round while it sits on IDLE
+    _next_clutch: dict = {}
+    # Whether the current round started from the reserved (preloaded) clutch
+    _warm_start: bool = False
+    # perf_counter() when the replay started, for the PLAYING->VAR_FREEZE histogram
+    _playing_at: float = 0.0
+    # perf_counter() when the frame froze, for the VAR_FREEZE->CLICK (think time) histogram
+    _frozen_at: float = 0.0
+
+    @rx.event(background=True)
+    @single_flight()
+    async def start_var_review(self):
+        """
+        Background replay flow: the state lock is only held while fields are
+        written, never while GRID is fetched or the clip plays.
+        """
+        logger.debug("start_var_review called")
+        tapped_at = time.perf_counter()
+        # Same element (and often the same src) as the last round: start from 0:00.
+        yield rx.call_script(REWIND_SCRIPT)
+        
+        # Option A: Take a prefetched clutch, fetching live from GRID only if the queue is dry
+        from .grid_service import GridService
+        from .prefetch import clutch_prefetcher
+        session = self.router.session.client_token
+        async with self:
+            clutch_data, self._next_clutch = self._next_clutch, {}
+            self._warm_start = bool(clutch_data)
+        if not clutch_data:
+            clutch_data = clutch_prefetcher.pop(session) or await GridService.fetch_live_clutch_async(session)
+        
+        async with self:
+            self._round += 1
+            round_id = self._round
+            self.phase = GamePhase.PLAYING
+            telemetry = await self.get_state(TelemetryState)
+            telemetry._apply_clutch(clutch_data)
+            playing_at = self._playing_at = time.perf_counter()
+        phase_transition_seconds.observe(playing_at - tapped_at, "IDLE->PLAYING")
+        
+        logger.debug("Loading video %s for round %s", clutch_data["video_url"], round_id)
+        # The browser freezes the replay on the event frame (see freeze_script);
+        # freeze_backstop starts from the first frame, not from here.
+
+    @rx.event(background=True)
+    @single_flight()
+    @timed(handler_seconds, handler="prepare_next_clip")
+    async def prepare_next_clip(self):
+        """
+        Reserve the next round's clutch while the kiosk is idle and point the
+        (hidden, still mounted) replay player and stills at it, so the browser
+        buffers the clip's first seconds and the event frame before the tap.
+        """
+        from .grid_service import GridService
+        from .prefetch import clutch_prefetcher
+        async with self:
+            clutch_data = self._next_clutch
+        if not clutch_data:
+            session = self.router.session.client_token
+            clutch_data = clutch_prefetcher.pop(session) or await GridService.fetch_live_clutch_async(session)
+        async with self:
+            if not self._next_clutch:
+                self._next_clutch = clutch_data
+            # A tap during the fetch already started a round; keep the
+            # reservation for the next one but leave the playing media alone.
+            if self.phase == GamePhase.IDLE:
+                telemetry = await self.get_state(TelemetryState)
+                telemetry._apply_media(self._next_clutch)
+
+    def record_first_frame(self, elapsed_ms: float | None):
+        """
+        Client callback from the replay's first frame with ms since the START
+        tap; None for `playing` events after the round's first one. Starts
+        the server-side freeze backstop for the round.
+        """
+        if elapsed_ms is None:
+            return
+        try:
+            first_frame_stats.record(float(elapsed_ms), self._warm_start)
+        except (TypeError, ValueError):
+            first_frame_stats.rejected += 1
+        if self.phase == GamePhase.PLAYING:
+            return GameState.freeze_backstop(self._round)
+
+    @rx.event(background=True)
+    async def freeze_backstop(self, round_id: int):
+        """
+        Freeze the round if the browser has not done it by the end of the
+        clip plus a margin (a stalled or throttled tab, a lost event).
+        """
+        async with self:
+            duration = (await self.get_state(TelemetryState))._clip_duration
+        await asyncio.sleep(duration + FREEZE_BACKSTOP_MARGIN)
+        async with self:
+            if self._round == round_id and self.phase == GamePhase.PLAYING:
+                logger.debug("freeze backstop fired for round %s", round_id)
+                await self._freeze()
+
+    async def _freeze(self):
+        """
+        Enter VAR_FREEZE and hand the browser what it needs to score the click
+        itself; the target is only published once the replay is over.
+        """
+        self.phase = GamePhase.VAR_FREEZE
+        self._frozen_at = time.perf_counter()
+        if self._playing_at:
+            phase_transition_seconds.observe(self._frozen_at - self._playing_at, "PLAYING->VAR_FREEZE")
+        telemetry = await self.get_state(TelemetryState)
+        result = await self.get_state(ResultState)
+        result.target_x = telemetry._target_x
+        result.target_y = telemetry._target_y
+        result.score_slope = default_rules.client_slope(telemetry._event_type)
+
+    @timed(handler_seconds, handler="trigger_freeze")
+    async def trigger_freeze(self):
+        logger.debug("trigger_freeze called")
+        if self.phase == GamePhase.PLAYING:
+            await self._freeze()
+
+    @timed(handler_seconds, handler="reset_game")
+    async def reset_game(self):
+        self.phase = GamePhase.IDLE
+        (await self.get_state(ResultState)).reset()
+        # Rewound while hidden so the idle preload buffers the clip's opening.
+        return [rx.call_script(REWIND_SCRIPT), GameState.prepare_next_clip]
+
+class TelemetryState(GameState):
+    """The current clip: what the HUD shows plus the backend-only scoring target."""
     player_name: str = "C9_OXY"
-    event_type: str = "ability_cast"
     match_name: str = "VCT Americas: Cloud9 vs LOUD"
     timestamp: str = "00:14:22:04"
     frame_id: str = "RX-9922-84"
     video_url: str = "https://reflex-var-assets.s3.amazonaws.com/c9_oxy_flash.mp4"
+    # Precomputed event-frame still for the freeze/result screens ("" = none yet)
+    still_url: str = ""
+    still_srcset: str = ""
+    still_webp_srcset: str = ""
     is_live: bool = False
+    grid_circuit: str = "CLOSED"
+    # Replay offset (seconds) the browser pauses on: the event frame the still shows
+    freeze_at: float = event_offset(DEFAULT_CLIP_DURATION)
 
-    def submit_score(self):
-        if self.user_initials:
-            with rx.session() as session:
-                session.add(
-                    ScoreEntry(
-                        initials=self.user_initials.upper(),
-                        accuracy=self.accuracy,
-                        timestamp=self.timestamp,
-                    )
-                )
-                session.commit()
-            self.user_initials = ""
-            return rx.redirect("/leaderboard") # Or update phase
+    # Not rendered, and the target must not reach the client before the click
+    _event_type: str = "ability_cast"
+    _target_x: float = 0.5
+    _target_y: float = 0.5
+    _clip_duration: float = DEFAULT_CLIP_DURATION
 
-    @rx.var
-    def leaderboard(self) -> list[ScoreEntry]:
-        try:
-            with rx.session() as session:
-                return session.exec(
-                    ScoreEntry.select().order_by(ScoreEntry.accuracy.desc()).limit(5)
-                ).all()
-        except Exception:
-            # Return empty list if database is not yet initialized
-            return []
+    def _apply_media(self, clutch_data: dict):
+        self.video_url = clutch_data["video_url"]
+        self.still_url = clutch_data.get("still_url", "")
+        self.still_srcset = clutch_data.get("still_srcset", "")
+        self.still_webp_srcset = clutch_data.get("still_webp_srcset", "")
 
-    async def start_var_review(self):
-        print("[DEBUG_LOG] start_var_review called")
-        self.phase = GamePhase.PLAYING
-        
-        # Option A: Fetch live data from GRID
-        from .grid_service import GridService
-        clutch_data = GridService.fetch_live_clutch()
-        
+    def _apply_clutch(self, clutch_data: dict):
         self.player_name = clutch_data["player"]
-        self.event_type = clutch_data["event"]
+        self._event_type = clutch_data["event"]
         self.match_name = clutch_data.get("match", "Official Match")
         self.timestamp = clutch_data["timestamp"]
-        self.target_x = clutch_data["target_x"]
-        self.target_y = clutch_data["target_y"]
+        self._target_x = clutch_data["target_x"]
+        self._target_y = clutch_data["target_y"]
         self.frame_id = clutch_data["frame_id"]
-        self.video_url = clutch_data["video_url"]
+        self._clip_duration = clutch_data.get("clip_duration", DEFAULT_CLIP_DURATION)
+        self.freeze_at = event_offset(self._clip_duration)
+        self._apply_media(clutch_data)
         self.is_live = clutch_data["is_live"]
-        
-        print(f"[DEBUG_LOG] Loading video: {self.video_url}")
-        
-        # Simulate the "Video" playing for 6 seconds to ensure buffering and display
+        self.grid_circuit = clutch_data.get("grid_circuit", "CLOSED")
+
+class ResultState(GameState):
+    """The player's click on the frozen frame and how it scored."""
+    # Published at VAR_FREEZE for the browser's provisional score
+    target_x: float = 0.5
+    target_y: float = 0.5
+    score_slope: float = DEFAULT_SLOPE
+    user_x: float = 0.0
+    user_y: float = 0.0
+    accuracy: float = 0.0
+    # False between the provisional (browser) score and the server's recompute
+    score_verified: bool = False
+
+    # Rank of the last submitted score (0 until a score is saved)
+    user_rank: int = 0
+
+    @single_flight()
+    @timed(handler_seconds, handler="handle_click")
+    async def handle_click(self, hit: dict):
+        """
+        hit is computed in the browser (see HIT_SCRIPT): click coordinates
+        normalized to the frozen frame and a provisional accuracy. The result
+        screen renders from those at once; the server then recomputes the
+        score, and submit_score refuses it until that has happened.
+        """
+        logger.debug("handle_click called with: %s", hit)
+        if self.phase != GamePhase.VAR_FREEZE:
+            return
+        try:
+            self.user_x = max(0.0, min(1.0, float(hit["x"])))
+            self.user_y = max(0.0, min(1.0, float(hit["y"])))
+        except (KeyError, TypeError, ValueError) as e:
+            logger.debug("Error parsing click coords: %s", e)
+            self.user_x = 0.5
+            self.user_y = 0.5
+        try:
+            provisional = max(0.0, min(100.0, float(hit["accuracy"])))
+        except (KeyError, TypeError, ValueError):
+            provisional = 0.0
+        self.accuracy = round(provisional, 1)
+        self.score_verified = False
+        self.phase = GamePhase.RESULT
+        if self._frozen_at:
+            # The player's think time; click-to-result latency comes from the browser (record_result_render).
+            phase_transition_seconds.observe(time.perf_counter() - self._frozen_at, "VAR_FREEZE->CLICK")
         yield
-        await asyncio.sleep(6)
-        print(f"[DEBUG_LOG] Transitioning to VAR_FREEZE with URL: {self.video_url}")
-        self.phase = GamePhase.VAR_FREEZE
 
-    def trigger_freeze(self):
-        print("[DEBUG_LOG] trigger_freeze called")
-        self.phase = GamePhase.VAR_FREEZE
-    
-    def handle_click(self, event_dict: dict):
-        # event_dict usually contains page_x, page_y or client_x, client_y
-        print(f"[DEBUG_LOG] handle_click called with: {event_dict}")
-        if self.phase == GamePhase.VAR_FREEZE:
-            # Extract coordinates from Reflex click event
-            # Note: This depends on the exact event structure, typically clientX/clientY
-            try:
-                # Approximate normalization based on 1080p kiosk expectation
-                # In a production kiosk, we would use screen dimensions
-                raw_x = event_dict.get("clientX", 0)
-                raw_y = event_dict.get("clientY", 0)
-                
-                # We need to map the click on the 92vw x 78vh box to 0-1
-                # For now, let's keep it simple as a ratio of common 1080p
-                self.user_x = raw_x / 1920.0
-                self.user_y = raw_y / 1080.0
-                
-                # Ensure values are within 0-1
-                self.user_x = max(0.0, min(1.0, self.user_x))
-                self.user_y = max(0.0, min(1.0, self.user_y))
-            except Exception as e:
-                print(f"[DEBUG_LOG] Error parsing click coords: {e}")
-                self.user_x = 0.5
-                self.user_y = 0.5
-            
-            # Use GridService to calculate accuracy
-            from .grid_service import GridService
-            self.accuracy = round(GridService.calculate_pro_accuracy(
-                (self.user_x, self.user_y), 
-                (self.target_x, self.target_y)
-            ), 1)
-            self.phase = GamePhase.RESULT
-
-    def reset_game(self):
-        self.phase = GamePhase.IDLE
-        self.accuracy = 0.0
-        self.user_x = 0.0
-        self.user_y = 0.0
+        # Verify: the authoritative score uses the backend-only target and the live rules.
+        from .grid_service import GridService
+        telemetry = await self.get_state(TelemetryState)
+        self.target_x = telemetry._target_x
+        self.target_y = telemetry._target_y
+        accuracy = round(GridService.calculate_pro_accuracy(
+            (self.user_x, self.user_y),
+            (self.target_x, self.target_y),
+            telemetry._event_type,
+        ), 1)
+        if abs(accuracy - self.accuracy) > 0.1:
+            score_checks["corrected"] += 1
+            logger.warning("provisional score %s corrected to %s", self.accuracy, accuracy)
+        else:
+            score_checks["verified"] += 1
+        self.accuracy = accuracy
+        self.score_verified = True
+
+    def record_result_render(self, elapsed_ms: float | None):
+        """
+        Client callback from the RESULT view's first paint with ms since the
+        scoring click's pointerdown (see RESULT_RENDER_SCRIPT); None when the
+        view was not reached by a click.
+        """
+        if elapsed_ms is None:
+            return
+        try:
+            elapsed = float(elapsed_ms) / 1000
+        except (TypeError, ValueError):
+            return
+        # Negative or absurd values mean the click mark was missing or stale.
+        if 0 < elapsed < 60:
+            phase_transition_seconds.observe(elapsed, "CLICK->RESULT")
+
+class InputState(GameState):
+    """Initials entry on the result screen."""
+    user_initials: str = ""
+
+    @timed(handler_seconds, handler="set_user_initials")
+    def set_user_initials(self, val: str):
+        self.user_initials = val.upper()[:3]
+
+    @single_flight()
+    @timed(handler_seconds, handler="submit_score")
+    async def submit_score(self, form_data: dict | None = None):
+        # The form sends the raw field; it goes through the same validation as blur.
+        if form_data and "initials" in form_data:
+            self.set_user_initials(str(form_data["initials"]))
+        result = await self.get_state(ResultState)
+        if self.user_initials and result.score_verified:
+            telemetry = await self.get_state(TelemetryState)
+            # Acknowledge immediately; the score writer group-commits in the background
+            score_writer.submit(
+                ScoreEntry(
+                    initials=self.user_initials.upper(),
+                    accuracy=result.accuracy,
+                    timestamp=telemetry.timestamp,
+                    user_x=result.user_x,
+                    user_y=result.user_y,
+                    target_x=result.target_x,
+                    target_y=result.target_y,
+                    event_type=telemetry._event_type,
+                )
+            )
+            result.user_rank = await leaderboard_cache.rank_for(result.accuracy) + score_writer.pending_better(result.accuracy)
+            self.user_initials = ""
+            return rx.redirect("/leaderboard") # Or update phase
+
+class LeaderboardState(rx.State):
+    """
+    Per-session copy of the process-wide leaderboard snapshot. Written by
+    LeaderboardBroadcaster for every connected kiosk; nothing here queries the DB.
+    """
+    rows: list[LeaderboardRow] = []
+
+    _version: str = ""
+
+    def _apply_snapshot(self, version: str, rows: list[LeaderboardRow]):
+        if version != self._version:
+            self._version = version
+            self.rows = rows
+
+    async def sync(self):
+        self._apply_snapshot(*await leaderboard_broadcaster.current())
@@ -0,0 +1,250 @@
+"""
+Precomputed freeze-frame stills.
+
+The freeze and result screens show one frame of the clip. Instead of
+mounting a paused <video> (which re-buffers the clip and shows whatever
+frame decodes first), an offline job extracts the event frame once per
+clip in several widths as WebP and JPEG:
+
+    python -m reflex_var.stills --widths 1920,1280,640 --jobs 4
+
+Clips are cut to end on their event, so the event frame is the last frame
+of the replay (clip_duration seconds in). Stills are stored content-addressed
+under still_dir and indexed in the catalog file; the backend serves them
+from /stills with immutable cache headers. Requires ffmpeg on PATH.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import os
+import re
+import shutil
+import sqlite3
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import reflex as rx
+from starlette.responses import FileResponse
+
+from .settings import Setting
+
+STILL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS still (
+    frame_key TEXT NOT NULL,
+    format TEXT NOT NULL,
+    width INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    PRIMARY KEY (frame_key, format, width)
+);
+"""
+
+# ffmpeg output options per still format.
+FORMATS = {
+    "webp": ["-c:v", "libwebp", "-quality", "80", "-f", "webp"],
+    "jpg": ["-c:v", "mjpeg", "-q:v", "4", "-f", "image2pipe"],
+}
+
+# Step back from the very end of the clip so the decoder has a frame to return.
+_END_MARGIN = 0.05
+
+_NAME = re.compile(r"^[0-9a-f]{16}\.(webp|jpg)$")
+
+
+def frame_key(remote_url: str, offset: float) -> str:
+    """Identity of one frame of one video; clips sharing a video share stills."""
+    return hashlib.sha1(f"{remote_url}@{offset:.3f}".encode()).hexdigest()[:16]
+
+
+def event_offset(clip_duration: float) -> float:
+    return max(0.0, clip_duration - _END_MARGIN)
+
+
+class StillIndex:
+    """
+    In-memory view of the still table: frame key -> {format: [(width, name)]}.
+    Loaded from the catalog file on first use; the backend answers lookups
+    and serves the files.
+    """
+
+    directory = Setting("still_dir", ".stills", str)
+
+    def __init__(self, directory: str | None = None):
+        self._directory = directory
+        self._lock = threading.Lock()
+        self._frames: dict[str, dict[str, list[tuple[int, str]]]] | None = None
+        self.requests = 0
+        self.bytes_served = 0
+
+    @property
+    def frames(self) -> dict[str, dict[str, list[tuple[int, str]]]]:
+        if self._frames is None:
+            self.load()
+        return self._frames
+
+    def load(self):
+        from .catalog import clutch_catalog
+
+        frames: dict[str, dict[str, list[tuple[int, str]]]] = {}
+        path = clutch_catalog.path
+        if os.path.exists(path):
+            try:
+                connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+                try:
+                    rows = connection.execute("SELECT frame_key, format, width, name FROM still ORDER BY width").fetchall()
+                finally:
+                    connection.close()
+            except sqlite3.Error:
+                # No still table yet: the pipeline has not been run.
+                rows = []
+            for key, fmt, width, name in rows:
+                frames.setdefault(key, {}).setdefault(fmt, []).append((width, name))
+        with self._lock:
+            self._frames = frames
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self):
+        """Load the still index off the event loop at startup."""
+        await asyncio.to_thread(self.load)
+        yield
+
+    def urls(self, remote_url: str, clip_duration: float) -> dict:
+        """
+        still_url (largest JPEG), still_srcset and still_webp_srcset for a clip,
+        or empty strings when no still has been extracted.
+        """
+        variants = self.frames.get(frame_key(remote_url, event_offset(clip_duration)))
+        if not variants or "jpg" not in variants:
+            return {"still_url": "", "still_srcset": "", "still_webp_srcset": ""}
+        base = f"{rx.config.get_config().api_url.rstrip('/')}/stills"
+
+        def srcset(fmt: str) -> str:
+            return ", ".join(f"{base}/{name} {width}w" for width, name in variants.get(fmt, []))
+
+        return {
+            "still_url": f"{base}/{variants['jpg'][-1][1]}",
+            "still_srcset": srcset("jpg"),
+            "still_webp_srcset": srcset("webp"),
+        }
+
+    def response(self, name: str) -> FileResponse | None:
+        """Still file with year-long immutable caching; names are content hashes."""
+        path = os.path.join(self.directory, name)
+        if not _NAME.match(name) or not os.path.isfile(path):
+            return None
+        self.requests += 1
+        self.bytes_served += os.path.getsize(path)
+        return FileResponse(
+            path,
+            media_type="image/webp" if name.endswith(".webp") else "image/jpeg",
+            headers={"Cache-Control": "public, max-age=31536000, immutable"},
+        )
+
+    def stats(self) -> dict:
+        return {
+            "frames": len(self.frames),
+            "requests": self.requests,
+            "bytes_served": self.bytes_served,
+        }
+
+
+still_index = StillIndex()
+
+
+def extract(source: str, offset: float, width: int, fmt: str) -> bytes:
+    """One still from `source` (file path or URL) at `offset` seconds, scaled to at most `width` px wide."""
+    result = subprocess.run(
+        [
+            "ffmpeg", "-v", "error", "-ss", f"{offset:.3f}", "-i", source,
+            "-frames:v", "1", "-vf", f"scale='min({width},iw)':-2", *FORMATS[fmt], "pipe:1",
+        ],
+        capture_output=True,
+        check=True,
+        timeout=120,
+    )
+    if not result.stdout:
+        raise ValueError(f"ffmpeg returned no frame at {offset:.3f}s")
+    return result.stdout
+
+
+def store(directory: str, data: bytes, fmt: str) -> str:
+    """Write a still under its content hash; identical frames are stored once."""
+    name = f"{hashlib.sha256(data).hexdigest()[:16]}.{fmt}"
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        partial = f"{path}.part"
+        with open(partial, "wb") as f:
+            f.write(data)
+        os.replace(partial, path)
+    return name
+
+
+def main():
+    from .catalog import clutch_catalog, connect
+    from .grid_service import MediaService
+    from .media_cache import media_cache
+
+    parser = argparse.ArgumentParser(description="Extract freeze-frame stills for every catalogued clip.")
+    parser.add_argument("--widths", default="1920,1280,640", help="Comma-separated output widths in px")
+    parser.add_argument("--formats", default="webp,jpg", help="Comma-separated formats (webp, jpg)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 2, help="Parallel ffmpeg processes")
+    parser.add_argument("--force", action="store_true", help="Re-extract frames that already have stills")
+    args = parser.parse_args()
+
+    if shutil.which("ffmpeg") is None:
+        raise SystemExit("[STILLS] ffmpeg not found on PATH")
+    widths = sorted({int(w) for w in args.widths.split(",")})
+    formats = [f.strip() for f in args.formats.split(",")]
+
+    # Unique (video, offset) frames across the catalog.
+    clutch_catalog.load()
+    frames: dict[str, tuple[str, float]] = {}
+    for clip in clutch_catalog.clips:
+        remote_url = MediaService.remote_video_url(clip.series_id)
+        offset = event_offset(clip.clip_duration)
+        frames.setdefault(frame_key(remote_url, offset), (remote_url, offset))
+
+    connection = connect(clutch_catalog.path)
+    connection.executescript(STILL_SCHEMA)
+    done = {row[0] for row in connection.execute("SELECT DISTINCT frame_key FROM still")}
+    todo = {key: frame for key, frame in frames.items() if args.force or key not in done}
+    os.makedirs(still_index.directory, exist_ok=True)
+    print(f"[STILLS] {len(frames)} frames in catalog, {len(todo)} to extract")
+
+    def work(key: str, remote_url: str, offset: float) -> list[tuple]:
+        # Prefer the local media cache copy over streaming the clip again.
+        name = media_cache.name_for(remote_url)
+        source = media_cache.path_for(name) if name in media_cache.files else remote_url
+        rows = []
+        for fmt in formats:
+            for width in widths:
+                data = extract(source, offset, width, fmt)
+                rows.append((key, fmt, width, store(still_index.directory, data, fmt), len(data)))
+        return rows
+
+    started = time.perf_counter()
+    completed = failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = {pool.submit(work, key, *frame): key for key, frame in todo.items()}
+        for future in as_completed(futures):
+            try:
+                rows = future.result()
+            except (subprocess.SubprocessError, OSError, ValueError) as e:
+                failed += 1
+                print(f"[STILLS] {futures[future]}: {e}")
+                continue
+            with connection:
+                connection.executemany("INSERT OR REPLACE INTO still VALUES (?, ?, ?, ?, ?)", rows)
+            completed += 1
+            if completed % 50 == 0:
+                print(f"[STILLS] {completed}/{len(todo)} frames ({time.perf_counter() - started:.1f}s)")
+    connection.close()
+    print(f"[STILLS] done: {completed} extracted, {failed} failed in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,73 @@
+import os
+
 import reflex as rx
 
+# Database pool sizing, read by Reflex when it builds the sync and async engines.
+# Override per deployment with the same environment variables.
+os.environ.setdefault("SQLALCHEMY_POOL_SIZE", "10")
+os.environ.setdefault("SQLALCHEMY_MAX_OVERFLOW", "20")
+os.environ.setdefault("SQLALCHEMY_POOL_TIMEOUT", "10")
+os.environ.setdefault("SQLALCHEMY_POOL_RECYCLE", "1800")
+
 config = rx.Config(
     app_name="reflex_var",
+    # Sync URL is used by Alembic/`reflex db`; the app itself uses the async one.
+    # Postgres: postgresql://... and postgresql+asyncpg://... (or REFLEX_DB_URL / REFLEX_ASYNC_DB_URL env vars)
+    db_url="sqlite:///reflex.db",
+    async_db_url="sqlite+aiosqlite:///reflex.db",
     disable_plugins=['reflex.plugins.sitemap.SitemapPlugin'],
-)
\ No newline at end of file
+    # Max in-flight requests (and pooled connections) to the GRID API
+    grid_max_concurrency=8,
+    # Ready-to-play clutch records kept warm by the background prefetcher
+    clutch_prefetch_size=4,
+    # Clutch catalog file (build with `python -m reflex_var.catalog --seed`) and
+    # how many recent clips each kiosk session avoids repeating
+    clutch_catalog_path="clutch_catalog.db",
+    clutch_no_repeat_window=20,
+    # Local clip cache served from /media: directory, size budget (0 disables),
+    # seconds between prefetches of newly catalogued series
+    media_cache_dir=".media_cache",
+    media_cache_max_bytes=2 * 1024**3,
+    media_prefetch_interval=600,
+    # Freeze-frame stills written by `python -m reflex_var.stills`
+    still_dir=".stills",
+    # Score share QR codes rendered at /qr: link they encode, rendered codes kept in memory
+    share_base_url="https://reflex-var.com/share",
+    qr_cache_max_entries=256,
+    # Incremental GRID -> catalog sync: seconds between passes, series per page
+    grid_sync_interval=300,
+    grid_sync_page_size=50,
+    # Serve GRID from recorded fixtures instead of the network (set
+    # GRID_FIXTURES_RECORD=1 with a real key to capture new ones)
+    grid_fixtures_dir=os.getenv("GRID_FIXTURES_DIR"),
+    grid_fixtures_record=os.getenv("GRID_FIXTURES_RECORD") == "1",
+    # GRID circuit breaker: consecutive failures to open, seconds before a probe, probe jitter
+    grid_breaker_failure_threshold=3,
+    grid_breaker_cooldown=30,
+    grid_breaker_jitter=0.2,
+    # Bearer token for the /admin routes (profiler, scoring reload); unset disables them
+    admin_token=os.getenv("REFLEX_VAR_ADMIN_TOKEN"),
+    # Level for the reflex_var loggers (DEBUG traces every game event handler)
+    log_level=os.getenv("REFLEX_VAR_LOG_LEVEL", "INFO"),
+    # Seconds within which a repeated GameState handler call from one session is dropped
+    event_debounce_window=0.5,
+    # Rows kept in the in-process leaderboard top-K
+    leaderboard_size=5,
+    # Minimum seconds between leaderboard snapshot rebuilds pushed to all kiosks
+    leaderboard_broadcast_interval=1.0,
+    # Scoring: linear slope for event types without their own curve, and
+    # per-event-type curves, e.g. {"VALORANT_PLANT": {"slope": 250},
+    # "VALORANT_ABILITY": {"sigma": 0.08}}. After a change, run
+    # `python -m reflex_var.scoring` to re-score stored clicks and reload the backend.
+    scoring_default_slope=200.0,
+    scoring_curves={},
+    # Write-behind score queue: flush period, rows per transaction, retries per batch
+    score_flush_interval_ms=200,
+    score_batch_size=50,
+    score_max_retries=3,
+    # Flushes a batch may fail (locked/disconnected DB) before its rows go to the
+    # dead-letter file (other errors go there at once), and rows held in memory
+    score_max_attempts=5,
+    score_max_pending=10_000,
+    score_dead_letter_path="score_dead_letter.jsonl",
+)
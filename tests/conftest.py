@@ -0,0 +1,38 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Point the app's database at a throwaway file before reflex loads rxconfig.
+_DB_DIR = tempfile.mkdtemp(prefix="reflex_var_tests_")
+DB_PATH = Path(_DB_DIR) / "reflex.db"
+os.environ["REFLEX_DB_URL"] = f"sqlite:///{DB_PATH}"
+os.environ["REFLEX_ASYNC_DB_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+
+# rxconfig.py sits at the repository root.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def database():
+    """A fresh scoreentry table; yields the SQLite file path."""
+    import reflex as rx
+    from sqlmodel import SQLModel
+
+    from reflex_var.state import ScoreEntry
+
+    engine = rx.model.get_engine()
+    SQLModel.metadata.drop_all(engine, tables=[ScoreEntry.__table__])
+    SQLModel.metadata.create_all(engine, tables=[ScoreEntry.__table__])
+    yield DB_PATH
+
+
+@pytest.fixture(autouse=True)
+def _no_debounce():
+    """single_flight is keyed by client token; every test state has the same (empty) one."""
+    from reflex_var import events
+
+    events._last_started.clear()
+    events._running.clear()
@@ -0,0 +1,51 @@
+import sqlite3
+
+from reflex_var.catalog import SOURCE_GRID, SOURCE_IMPORT, Clip, ClutchCatalog, write_clips
+
+
+def _catalog(tmp_path, count: int, window: int = 20) -> ClutchCatalog:
+    path = str(tmp_path / "catalog.db")
+    write_clips(path, [
+        Clip(f"clip-{index}", "PLAYER", "EVENT", "00:00:00:00", 0.5, 0.5, f"series-{index}", "MATCH")
+        for index in range(count)
+    ])
+    return ClutchCatalog(path=path, no_repeat_window=window)
+
+
+def test_small_pool_rotates_through_every_clip(tmp_path):
+    catalog = _catalog(tmp_path, 3)
+    picks = [catalog.pick("kiosk-1").clip_id for _ in range(30)]
+    # Every run of three consecutive picks covers the whole pool.
+    assert all(len(set(picks[i:i + 3])) == 3 for i in range(len(picks) - 2))
+
+
+def test_window_prevents_repeats_in_large_pool(tmp_path):
+    catalog = _catalog(tmp_path, 50, window=20)
+    picks = [catalog.pick("kiosk-1").clip_id for _ in range(60)]
+    assert all(len(set(picks[i:i + 21])) == 21 for i in range(len(picks) - 20))
+
+
+def test_sessions_are_independent(tmp_path):
+    catalog = _catalog(tmp_path, 1)
+    assert catalog.pick("kiosk-1").clip_id == catalog.pick("kiosk-2").clip_id == "clip-0"
+    assert catalog.pick("kiosk-1").clip_id == "clip-0"
+
+
+def test_catalog_file_without_source_column_is_upgraded(tmp_path):
+    path = str(tmp_path / "catalog.db")
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE clip (clip_id TEXT PRIMARY KEY, player TEXT, event TEXT, timestamp TEXT, target_x REAL, target_y REAL,"
+        " series_id TEXT, match TEXT, clip_duration REAL NOT NULL DEFAULT 6.0, weight REAL NOT NULL DEFAULT 1.0)"
+    )
+    connection.execute("INSERT INTO clip VALUES ('old-1', 'PLAYER', 'EVENT', '00:00:00:00', 0.5, 0.5, 'series-1', 'MATCH', 6.0, 1.0)")
+    connection.commit()
+    connection.close()
+
+    catalog = ClutchCatalog(path=path)
+    catalog.load()
+    assert [clip.source for clip in catalog.clips] == [SOURCE_IMPORT]
+
+    write_clips(path, [Clip("grid-1", "PLAYER", "EVENT", "00:00:00:00", 0.5, 0.5, "series-2", "MATCH", source=SOURCE_GRID)])
+    catalog.load(force=True)
+    assert {clip.clip_id: clip.source for clip in catalog.clips} == {"old-1": SOURCE_IMPORT, "grid-1": SOURCE_GRID}
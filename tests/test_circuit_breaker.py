@@ -0,0 +1,31 @@
+import asyncio
+
+import pytest
+
+from reflex_var.circuit_breaker import CircuitBreaker, CircuitState
+from reflex_var.grid_client import grid_client
+from reflex_var.grid_service import GridService
+
+
+def test_cancelled_probe_releases_the_half_open_slot(monkeypatch):
+    breaker = CircuitBreaker("test", failure_threshold=1, cooldown=0, jitter=0)
+    breaker.record_failure()
+    monkeypatch.setattr("reflex_var.grid_service.grid_breaker", breaker)
+
+    async def hang(*args, **kwargs):
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(grid_client, "post_json", hang)
+
+    async def scenario():
+        probe = asyncio.create_task(GridService._post_async("{ ping }"))
+        await asyncio.sleep(0)
+        assert breaker.state == CircuitState.HALF_OPEN
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+    asyncio.run(scenario())
+    # The next request is let through as a new probe instead of being rejected.
+    assert breaker.allow_request()
+    assert breaker.rejected == 0
@@ -0,0 +1,66 @@
+import json
+
+import httpx
+
+from reflex_var import fonts
+
+CSS = """
+/* cyrillic */
+@font-face {
+  font-family: 'JetBrains Mono';
+  font-style: normal;
+  font-weight: 400 800;
+  font-display: swap;
+  src: url(https://fonts.gstatic.com/s/jbm-cyrillic.woff2) format('woff2');
+  unicode-range: U+0400-045F;
+}
+/* latin */
+@font-face {
+  font-family: 'JetBrains Mono';
+  font-style: normal;
+  font-weight: 400 800;
+  font-display: swap;
+  src: url(https://fonts.gstatic.com/s/jbm-latin.woff2) format('woff2');
+  unicode-range: U+0000-00FF;
+}
+/* latin */
+@font-face {
+  font-family: 'Noto Sans';
+  font-style: normal;
+  font-weight: 400;
+  font-display: swap;
+  src: url(https://fonts.gstatic.com/s/noto-latin.woff2) format('woff2');
+  unicode-range: U+0000-00FF;
+}
+"""
+
+
+def _google(request: httpx.Request) -> httpx.Response:
+    if request.url.host == "fonts.googleapis.com":
+        return httpx.Response(200, text=CSS)
+    return httpx.Response(200, content=request.url.path.encode())
+
+
+def test_fallback_preconnects_to_google_fonts(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    assert fonts.stylesheets() == [fonts.GOOGLE_FONTS_URL]
+    links = [link.render() for link in fonts.preload_links()]
+    assert [set(link["props"]) for link in links] == [
+        {'rel:"preconnect"', f'href:"{origin}"', 'crossOrigin:"anonymous"'} for origin in fonts.GOOGLE_FONTS_ORIGINS
+    ]
+
+
+def test_vendor_keeps_requested_subsets_and_preloads(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    manifest = fonts.vendor({"latin"}, {"JetBrains Mono"}, transport=httpx.MockTransport(_google))
+
+    assert len(manifest["files"]) == 2
+    assert all(name.endswith(".woff2") and "-latin." in name for name in manifest["files"])
+    assert [href.split("/")[-1].split(".")[0] for href in manifest["preload"]] == ["jetbrains-mono-400-800-latin"]
+    css = (tmp_path / fonts.FONTS_DIR / "fonts.css").read_text()
+    assert "gstatic" not in css.split("*/", 1)[1] and css.count("@font-face") == 2
+    assert json.loads((tmp_path / fonts.MANIFEST).read_text()) == manifest
+    assert fonts.stylesheets() == ["/fonts/fonts.css"]
+    assert ['rel:"preload"' in link.render()["props"] for link in fonts.preload_links()] == [True]
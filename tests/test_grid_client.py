@@ -0,0 +1,63 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from reflex_var import grid_client as grid_client_module
+from reflex_var.circuit_breaker import grid_breaker
+from reflex_var.grid_client import GridClient
+from reflex_var.grid_service import GridService
+
+LATENCY = 0.2
+
+
+def _slow_grid(latency: float = LATENCY) -> httpx.MockTransport:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json={"data": {"ok": True}})
+    return httpx.MockTransport(handler)
+
+
+async def _timed_posts(client: GridClient, count: int) -> tuple[float, int]:
+    """Wall time of `count` concurrent GRID posts, and event-loop ticks meanwhile."""
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticking = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    results = await asyncio.gather(*(GridService._post_async("query { ok }") for _ in range(count)))
+    elapsed = time.perf_counter() - started
+    ticking.cancel()
+    await client.aclose()
+    assert results == [{"data": {"ok": True}}] * count
+    return elapsed, ticks
+
+
+@pytest.fixture
+def grid(monkeypatch):
+    monkeypatch.setattr(grid_breaker, "allow_request", lambda: True)
+
+    def install(client: GridClient) -> GridClient:
+        monkeypatch.setattr(grid_client_module, "grid_client", client)
+        return client
+    return install
+
+
+def test_concurrent_grid_requests_overlap(grid):
+    client = grid(GridClient(max_concurrency=10, transport=_slow_grid()))
+    elapsed, ticks = asyncio.run(_timed_posts(client, 10))
+    # Ten requests cost about one request's latency, and the loop kept running.
+    assert LATENCY <= elapsed < LATENCY * 2
+    assert ticks >= LATENCY / 0.01 / 2
+
+
+def test_concurrency_is_capped(grid):
+    client = grid(GridClient(max_concurrency=5, transport=_slow_grid()))
+    elapsed, _ = asyncio.run(_timed_posts(client, 10))
+    assert LATENCY * 2 <= elapsed < LATENCY * 3
@@ -0,0 +1,43 @@
+import asyncio
+
+from reflex_var.catalog import SOURCE_GRID, Clip, ClutchCatalog, library_clips, write_clips
+from reflex_var.circuit_breaker import grid_breaker
+from reflex_var.grid_service import GridService
+
+
+def _grid_catalog(tmp_path) -> ClutchCatalog:
+    path = str(tmp_path / "catalog.db")
+    write_clips(path, [Clip("grid-1", "PLAYER", "KILL", "00:31:02:11", 0.5, 0.5, "series-1", "MATCH", source=SOURCE_GRID)])
+    return ClutchCatalog(path=path)
+
+
+def test_live_clutch_comes_from_catalog_without_grid_request(tmp_path, monkeypatch):
+    async def no_network(*args, **kwargs):
+        raise AssertionError("a game must not query GRID")
+
+    monkeypatch.setattr(GridService, "API_KEY", "test-key")
+    monkeypatch.setattr(GridService, "_post_async", no_network)
+    monkeypatch.setattr("reflex_var.grid_service.clutch_catalog", _grid_catalog(tmp_path))
+
+    clutch = asyncio.run(GridService.fetch_live_clutch_async("kiosk-live"))
+
+    assert clutch["is_live"] is True
+    assert clutch["clip_id"] == "grid-1"
+    assert clutch["frame_id"] == clutch["series_id"]
+
+
+def test_library_clip_is_never_live(monkeypatch):
+    monkeypatch.setattr(GridService, "API_KEY", "test-key")
+
+    clutch = GridService.fetch_live_clutch("kiosk-library")
+
+    assert clutch["clip_id"] in {clip.clip_id for clip in library_clips()}
+    assert clutch["is_live"] is False
+
+
+def test_open_circuit_serves_local_data(tmp_path, monkeypatch):
+    monkeypatch.setattr(GridService, "API_KEY", "test-key")
+    monkeypatch.setattr("reflex_var.grid_service.clutch_catalog", _grid_catalog(tmp_path))
+    monkeypatch.setattr(type(grid_breaker), "is_open", property(lambda self: True))
+
+    assert GridService.fetch_live_clutch("kiosk-offline")["is_live"] is False
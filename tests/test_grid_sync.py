@@ -0,0 +1,40 @@
+import asyncio
+import sqlite3
+from pathlib import Path
+
+from reflex_var import grid_client as grid_client_module
+from reflex_var.catalog import SOURCE_GRID, SOURCE_LIBRARY, ClutchCatalog
+from reflex_var.grid_client import GridClient, RecordedGridTransport
+from reflex_var.grid_sync import GridSync
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures" / "grid"
+
+
+def test_three_passes_replay_recorded_grid(tmp_path, monkeypatch):
+    path = str(tmp_path / "catalog.db")
+    catalog = ClutchCatalog(path=path)
+    client = GridClient(transport=RecordedGridTransport(str(FIXTURES)))
+    monkeypatch.setattr("reflex_var.grid_sync.clutch_catalog", catalog)
+    monkeypatch.setattr(grid_client_module, "grid_client", client)
+
+    async def passes():
+        try:
+            # A fresh sync per pass, as after a restart: everything it resumes from is in the file.
+            return [(await GridSync(page_size=50).sync_once()).inserted for _ in range(3)]
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(passes()) == [3, 1, 0]
+
+    connection = sqlite3.connect(path)
+    try:
+        cursors = dict(connection.execute("SELECT name, value FROM sync_cursor"))
+        series = dict(connection.execute("SELECT series_id, event_cursor FROM series_sync"))
+        sources = dict(connection.execute("SELECT source, COUNT(*) FROM clip GROUP BY source"))
+    finally:
+        connection.close()
+    assert cursors == {"series.after": None, "series.updated_since": "2026-03-05T20:15:00Z", "series.updated_seen": None}
+    assert series["vct-americas-2026-c9-loud"] == "evt:4"
+    assert sources[SOURCE_GRID] == 4
+    assert sources[SOURCE_LIBRARY] > 0
+    assert sum(clip.source == SOURCE_GRID for clip in catalog.clips) == 4
@@ -0,0 +1,56 @@
+import gzip
+import io
+import json
+import sqlite3
+
+import pytest
+
+from reflex_var import importer
+from reflex_var.importer import _read_graphql, import_dumps
+
+
+def _event(index: int, x: float = 0.5) -> dict:
+    return {"type": "VALORANT_KILL", "timestamp": f"00:00:{index:02d}:00", "position": {"x": x, "y": 0.5}, "player": {"name": "P"}}
+
+
+def _response(series: list[tuple[str, list[dict]]]) -> dict:
+    return {"data": {"allSeries": {
+        "pageInfo": {"note": 'a string with "edges": [ and ] in it'},
+        "edges": [{"cursor": f"c{i}", "node": {"id": sid, "name": f"Series {sid}", "events": events}} for i, (sid, events) in enumerate(series)],
+    }}}
+
+
+def test_graphql_reader_is_independent_of_chunk_boundaries(monkeypatch):
+    first = _response([("s1", [_event(1), _event(2)]), ("s2", [])])
+    second = _response([("s3", [_event(3)])])
+    # Two concatenated responses, pretty-printed, as `curl >> dump.json` produces.
+    text = json.dumps(first, indent=2) + "\n" + json.dumps(second)
+    expected = first["data"]["allSeries"]["edges"] + second["data"]["allSeries"]["edges"]
+
+    for chunk_size in range(1, 201):
+        monkeypatch.setattr(importer, "_CHUNK_SIZE", chunk_size)
+        assert list(_read_graphql(io.StringIO(text), lambda: None)) == expected, chunk_size
+
+
+def test_graphql_reader_rejects_a_truncated_dump(monkeypatch):
+    text = json.dumps(_response([("s1", [_event(1)])]))
+    monkeypatch.setattr(importer, "_CHUNK_SIZE", 7)
+    with pytest.raises(ValueError):
+        list(_read_graphql(io.StringIO(text[: text.index("]}}") - 20]), lambda: None))
+
+
+def test_duplicates_and_off_screen_events_are_counted_not_inserted(tmp_path):
+    dump = tmp_path / "dump.json.gz"
+    with gzip.open(dump, "wt") as f:
+        json.dump(_response([("s1", [_event(1), _event(2), _event(1), _event(3, x=1.5)])]), f)
+    lines = tmp_path / "more.jsonl"
+    # The same series again in another dump, plus one new event.
+    lines.write_text(json.dumps({"id": "s1", "name": "Series s1", "events": [_event(2), _event(4)]}) + "\n")
+    catalog = tmp_path / "catalog.db"
+
+    stats = import_dumps([str(dump), str(lines)], str(catalog), batch_size=2, progress=None)
+
+    assert (stats.events, stats.inserted, stats.duplicates, stats.skipped) == (6, 3, 2, 1)
+    with sqlite3.connect(catalog) as connection:
+        timestamps = [row[0] for row in connection.execute("SELECT timestamp FROM clip ORDER BY timestamp")]
+    assert timestamps == ["00:00:01:00", "00:00:02:00", "00:00:04:00"]
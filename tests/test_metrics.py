@@ -0,0 +1,51 @@
+import asyncio
+import time
+
+from reflex.state import State
+
+from reflex_var.metrics import phase_transition_seconds, render
+from reflex_var.state import GamePhase, GameState, ResultState
+
+
+def _series(label: str) -> tuple[float, int]:
+    _, total, count = phase_transition_seconds._series.get(label, (None, 0.0, 0))
+    return total, count
+
+
+def test_freeze_to_click_is_the_players_think_time():
+    root = State(_reflex_internal_init=True)
+    game = root.get_substate(GameState.get_full_name().split(".")[1:])
+    result = root.get_substate(ResultState.get_full_name().split(".")[1:])
+    game.phase = GamePhase.PLAYING
+    before_total, before_count = _series("VAR_FREEZE->CLICK")
+
+    async def round_trip():
+        await GameState.event_handlers["trigger_freeze"].fn(game)
+        time.sleep(0.05)
+        async for _ in ResultState.event_handlers["handle_click"].fn(result, {"x": 0.5, "y": 0.5, "accuracy": 0}):
+            pass
+
+    asyncio.run(round_trip())
+
+    total, count = _series("VAR_FREEZE->CLICK")
+    assert count == before_count + 1
+    assert total - before_total >= 0.05
+    assert 'reflex_var_phase_transition_seconds_count{transition="VAR_FREEZE->CLICK"}' in render()
+
+
+def test_click_to_result_comes_from_the_browser():
+    root = State(_reflex_internal_init=True)
+    result = root.get_substate(ResultState.get_full_name().split(".")[1:])
+    before_total, before_count = _series("CLICK->RESULT")
+
+    record = ResultState.event_handlers["record_result_render"].fn
+    record(result, 84.0)
+    # A reload onto RESULT (no click mark) and garbage report nothing.
+    record(result, None)
+    record(result, -1)
+    record(result, "soon")
+
+    total, count = _series("CLICK->RESULT")
+    assert count == before_count + 1
+    assert abs(total - before_total - 0.084) < 1e-9
+    assert 'reflex_var_phase_transition_seconds_count{transition="CLICK->RESULT"}' in render()
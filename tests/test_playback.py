@@ -0,0 +1,40 @@
+from reflex.state import State
+
+from reflex_var.state import GamePhase, GameState, TelemetryState
+from reflex_var.stills import event_offset
+
+
+def _substate(cls):
+    root = State(_reflex_internal_init=True)
+    return root.get_substate(cls.get_full_name().split(".")[1:])
+
+
+def _game() -> GameState:
+    return _substate(GameState)
+
+
+def test_first_frame_starts_the_freeze_backstop():
+    game = _game()
+    game.phase = GamePhase.PLAYING
+    game._round = 4
+
+    backstop = GameState.event_handlers["record_first_frame"].fn(game, 120.0)
+
+    assert backstop.handler.fn.__name__ == "freeze_backstop"
+    assert [value._var_value for _, value in backstop.args] == [4]
+
+
+def test_later_playing_events_start_nothing():
+    game = _game()
+    game.phase = GamePhase.PLAYING
+    assert GameState.event_handlers["record_first_frame"].fn(game, None) is None
+
+
+def test_browser_pauses_on_the_still_frame():
+    telemetry = _substate(TelemetryState)
+    telemetry._apply_clutch({
+        "player": "P", "event": "E", "timestamp": "T", "target_x": 0.5, "target_y": 0.5,
+        "frame_id": "F", "video_url": "/v.mp4", "is_live": False, "clip_duration": 9.0,
+    })
+    assert telemetry.freeze_at == event_offset(9.0)
+    assert telemetry._clip_duration == 9.0
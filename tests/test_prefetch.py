@@ -0,0 +1,24 @@
+import asyncio
+
+from reflex_var.grid_service import MediaService
+from reflex_var.prefetch import ClutchPrefetcher
+
+
+def test_media_is_resolved_on_pop_not_on_refill(monkeypatch):
+    cached = set()
+
+    def resolve_media(series_id, clip_duration):
+        return {"video_url": "/media/local.mp4" if series_id in cached else "https://cdn/remote.mp4"}
+
+    monkeypatch.setattr(MediaService, "resolve_media", staticmethod(resolve_media))
+    prefetcher = ClutchPrefetcher(size=1)
+
+    async def scenario():
+        await prefetcher.refill_once()
+        # The media cache finishes its download while the record sits in the queue.
+        cached.add(prefetcher.queue._queue[0]["series_id"])
+        return prefetcher.pop()
+
+    record = asyncio.run(scenario())
+    assert record["video_url"] == "/media/local.mp4"
+    assert "grid_circuit" in record
@@ -0,0 +1,59 @@
+import json
+import threading
+
+import pytest
+import reflex as rx
+from starlette.testclient import TestClient
+
+from reflex_var.api import api
+from reflex_var.profiler import SamplingProfiler
+from reflex_var.state import InputState
+
+QUALNAME = "InputState.set_user_initials"
+
+
+def test_busy_handler_shows_up_in_both_formats():
+    state = InputState(_reflex_internal_init=True)
+    handler = InputState.event_handlers["set_user_initials"].fn
+    stop = threading.Event()
+
+    def play():
+        while not stop.is_set():
+            handler(state, "abc")
+
+    worker = threading.Thread(target=play, name="kiosk-handler")
+    worker.start()
+    try:
+        stacks, ticks = SamplingProfiler().sample(0.3, 0.002)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert ticks > 0
+    assert QUALNAME in SamplingProfiler.collapsed(stacks)
+    profile = SamplingProfiler.speedscope(stacks, 0.002)
+    json.dumps(profile)
+    frames = [frame["name"] for frame in profile["shared"]["frames"]]
+    assert any(name.startswith(QUALNAME + " ") for name in frames)
+
+
+@pytest.fixture
+def admin(monkeypatch):
+    monkeypatch.setattr(rx.config.get_config(), "admin_token", "secret", raising=False)
+    return {"Authorization": "Bearer secret"}
+
+
+@pytest.mark.parametrize("query", [
+    "seconds=nan", "seconds=inf", "seconds=0", "seconds=-1",
+    "interval_ms=nan", "interval_ms=-inf", "interval_ms=0", "interval_ms=-5",
+    "seconds=ten",
+])
+def test_profile_rejects_bad_durations(admin, query):
+    response = TestClient(api).get(f"/admin/profile?{query}", headers=admin)
+    assert response.status_code == 400
+
+
+def test_profile_returns_collapsed_stacks(admin):
+    response = TestClient(api).get("/admin/profile?seconds=0.05&interval_ms=5", headers=admin)
+    assert response.status_code == 200
+    assert response.text.strip()
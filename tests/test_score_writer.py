@@ -0,0 +1,125 @@
+import asyncio
+import json
+import sqlite3
+
+from sqlalchemy.exc import OperationalError
+
+from reflex_var.score_writer import ScoreWriter
+from reflex_var.state import ScoreEntry
+
+
+def _entry(initials: str, accuracy: float) -> ScoreEntry:
+    return ScoreEntry(initials=initials, accuracy=accuracy, timestamp="00:00:00:00")
+
+
+def _stored(path) -> list[tuple[str, float]]:
+    with sqlite3.connect(path) as connection:
+        return connection.execute("SELECT initials, accuracy FROM scoreentry ORDER BY id").fetchall()
+
+
+def test_shutdown_drains_queue_to_database(database):
+    # Interval and batch size high enough that only the shutdown drain commits.
+    writer = ScoreWriter(flush_interval=3600, batch_size=100, max_retries=0)
+
+    async def session():
+        async with writer.lifespan():
+            for index in range(3):
+                writer.submit(_entry(f"T{index}", 90.0 + index))
+            assert writer.depth == 3
+
+    asyncio.run(session())
+
+    assert writer.depth == 0
+    assert _stored(database) == [("T0", 90.0), ("T1", 91.0), ("T2", 92.0)]
+
+
+def _locked() -> OperationalError:
+    return OperationalError("INSERT INTO scoreentry ...", {}, sqlite3.OperationalError("database is locked"))
+
+
+def _dead_letters(path) -> list[dict]:
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_transient_failure_keeps_batch_queued(database):
+    writer = ScoreWriter(flush_interval=3600, batch_size=2, max_retries=1, max_attempts=3)
+    calls = []
+
+    async def locked(batch):
+        calls.append(len(batch))
+        raise _locked()
+
+    async def scenario():
+        writer.submit(_entry("AAA", 50.0))
+        writer.submit(_entry("BBB", 60.0))
+        writer.submit(_entry("CCC", 70.0))
+        writer._commit = locked
+        assert await writer.flush() == 0
+        del writer._commit
+        return await writer.flush()
+
+    committed = asyncio.run(scenario())
+
+    # Retried once within the flush, nothing lost, and the original order survives the re-queue.
+    assert calls == [2, 2]
+    assert writer.failures == 1
+    assert committed == 3
+    assert _stored(database) == [("AAA", 50.0), ("BBB", 60.0), ("CCC", 70.0)]
+
+
+def test_batch_is_dead_lettered_after_max_attempts(database, tmp_path):
+    dead_letter = tmp_path / "dead.jsonl"
+    writer = ScoreWriter(flush_interval=3600, batch_size=1, max_retries=0, max_attempts=3, dead_letter_path=str(dead_letter))
+
+    async def locked(batch):
+        raise _locked()
+
+    async def scenario():
+        writer.submit(_entry("AAA", 50.0))
+        writer.submit(_entry("BBB", 60.0))
+        writer._commit = locked
+        flushes = [await writer.flush() for _ in range(3)]
+        del writer._commit
+        return flushes, await writer.flush()
+
+    flushes, committed = asyncio.run(scenario())
+
+    # AAA blocks the queue for three flushes, then makes way for BBB.
+    assert flushes == [0, 0, 0]
+    assert [row["initials"] for row in _dead_letters(dead_letter)] == ["AAA"]
+    assert committed == 1
+    assert _stored(database) == [("BBB", 60.0)]
+
+
+def test_permanent_error_is_not_retried(database, tmp_path):
+    dead_letter = tmp_path / "dead.jsonl"
+    writer = ScoreWriter(flush_interval=3600, batch_size=2, max_retries=3, dead_letter_path=str(dead_letter))
+    calls = []
+
+    async def missing_column(batch):
+        calls.append(len(batch))
+        raise OperationalError("INSERT ...", {}, sqlite3.OperationalError("table scoreentry has no column named user_x"))
+
+    async def scenario():
+        writer.submit(_entry("AAA", 50.0))
+        writer._commit = missing_column
+        return await writer.flush()
+
+    assert asyncio.run(scenario()) == 0
+    assert calls == [1]
+    assert writer.depth == 0
+    (row,) = _dead_letters(dead_letter)
+    assert row["initials"] == "AAA" and row["accuracy"] == 50.0
+    assert "no column" in row["reason"]
+
+
+def test_queue_depth_is_capped(tmp_path):
+    dead_letter = tmp_path / "dead.jsonl"
+    writer = ScoreWriter(batch_size=100, max_pending=2, dead_letter_path=str(dead_letter))
+    for index in range(3):
+        writer.submit(_entry(f"T{index}", 50.0))
+
+    assert writer.depth == 2
+    assert writer.overflowed == 1
+    assert [row["initials"] for row in _dead_letters(dead_letter)] == ["T2"]
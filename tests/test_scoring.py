@@ -0,0 +1,65 @@
+import types
+
+import numpy as np
+import pytest
+import reflex as rx
+from starlette.testclient import TestClient
+
+from reflex_var.api import api
+from reflex_var.grid_service import GridService
+from reflex_var.leaderboard import leaderboard_cache
+from reflex_var.scoring import DEFAULT_SLOPE, ScoringRules, default_rules
+
+
+def _config(**values):
+    return types.SimpleNamespace(**values)
+
+
+def test_rules_from_config():
+    rules = ScoringRules.from_config(_config(
+        scoring_default_slope=100.0,
+        scoring_curves={"PLANT": {"slope": 250}, "ABILITY": {"sigma": 0.08}},
+    ))
+    scores = rules.score_batch(
+        np.array([[0.1, 0.0], [0.1, 0.0], [0.08, 0.0]]),
+        np.zeros((3, 2)),
+        ["OTHER", "PLANT", "ABILITY"],
+    )
+    assert scores == pytest.approx([90.0, 75.0, 100 * np.exp(-0.5)])
+    assert rules.client_slope("PLANT") == 250.0
+    assert rules.client_slope("OTHER") == 100.0
+
+
+def test_rules_from_config_rejects_ambiguous_curve():
+    with pytest.raises(ValueError):
+        ScoringRules.from_config(_config(scoring_curves={"PLANT": {"slope": 250, "sigma": 0.1}}))
+
+
+def test_live_scoring_follows_replaced_rules():
+    original = ScoringRules(default=default_rules.default, curves=default_rules.curves)
+    try:
+        default_rules.replace(ScoringRules.from_config(_config(scoring_default_slope=100.0)))
+        assert GridService.calculate_pro_accuracy((0.6, 0.5), (0.5, 0.5)) == pytest.approx(90.0)
+    finally:
+        default_rules.replace(original)
+    assert GridService.calculate_pro_accuracy((0.6, 0.5), (0.5, 0.5)) == pytest.approx(100 - 0.1 * DEFAULT_SLOPE)
+
+
+def test_reload_route_requires_admin_token(monkeypatch):
+    monkeypatch.setattr(rx.config.get_config(), "admin_token", "secret", raising=False)
+    client = TestClient(api)
+    assert client.post("/admin/scoring/reload").status_code == 401
+    assert client.post("/admin/scoring/reload", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+
+def test_reload_route_loads_config_rules_and_leaderboard(monkeypatch):
+    monkeypatch.setattr(rx.config.get_config(), "admin_token", "secret", raising=False)
+    default_rules.replace(ScoringRules.from_config(_config(scoring_default_slope=1.0)))
+    leaderboard_cache._loaded = True
+
+    response = TestClient(api).post("/admin/scoring/reload", headers={"Authorization": "Bearer secret"})
+
+    assert response.status_code == 200
+    # rxconfig's rules are live again and the top-K reloads on next read.
+    assert default_rules.client_slope(None) == rx.config.get_config().scoring_default_slope
+    assert not leaderboard_cache._loaded
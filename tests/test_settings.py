@@ -0,0 +1,23 @@
+from reflex_var.circuit_breaker import CircuitBreaker
+from reflex_var.score_writer import ScoreWriter
+
+
+def test_breaker_argument_overrides_config():
+    assert CircuitBreaker("grid", cooldown=1.5).cooldown == 1.5
+
+
+def test_breaker_settings_are_named_after_the_breaker():
+    assert CircuitBreaker("grid").failure_threshold == 3
+    breaker = CircuitBreaker("media")
+    assert (breaker.failure_threshold, breaker.cooldown, breaker.jitter) == (3, 30.0, 0.2)
+
+
+def test_score_writer_argument_overrides_config():
+    assert ScoreWriter(batch_size=7).batch_size == 7
+
+
+def test_score_writer_falls_back_to_rxconfig():
+    writer = ScoreWriter()
+    assert writer.flush_interval == 0.2
+    assert writer.batch_size == 50
+    assert writer.max_retries == 3
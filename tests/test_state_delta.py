@@ -0,0 +1,186 @@
+"""
+Websocket delta per event handler: each handler should only send the
+substate it touches, and only the fields that changed.
+"""
+
+import asyncio
+
+import pytest
+from reflex.state import State
+from reflex.utils.format import json_dumps
+
+from reflex_var.state import GamePhase, GameState, InputState, ResultState, TelemetryState
+
+
+def _substate(root: State, cls):
+    return root.get_substate(cls.get_full_name().split(".")[1:])
+
+
+def _fields(delta: dict, cls) -> set[str]:
+    """Field names a delta carries for one substate (reflex suffixes them)."""
+    return {name.removesuffix("_rx_state_") for name in delta.get(cls.get_full_name(), {})}
+
+
+@pytest.fixture
+def root() -> State:
+    root = State(_reflex_internal_init=True)
+    root._clean()
+    return root
+
+
+def _delta(root: State) -> tuple[dict, int]:
+    delta = root.get_delta()
+    root._clean()
+    return delta, len(json_dumps(delta))
+
+
+CLUTCH = {
+    "player": "C9_OXY", "event": "VALORANT_KILL", "timestamp": "00:14:22:04",
+    "target_x": 0.52, "target_y": 0.48, "frame_id": "series-1", "match": "VCT",
+    "video_url": "/media/clip.mp4", "is_live": True,
+}
+
+
+def test_set_user_initials_sends_only_the_field(root):
+    InputState.event_handlers["set_user_initials"].fn(_substate(root, InputState), "abcd")
+    delta, size = _delta(root)
+    assert list(delta) == [InputState.get_full_name()]
+    assert _fields(delta, InputState) == {"user_initials"}
+    assert size < 200
+
+
+def test_round_start_keeps_the_target_on_the_server(root):
+    _substate(root, TelemetryState)._apply_clutch(CLUTCH)
+    delta, size = _delta(root)
+    assert set(delta) == {TelemetryState.get_full_name()}
+    fields = _fields(delta, TelemetryState)
+    assert "player_name" in fields and "video_url" in fields
+    assert not {"_target_x", "_target_y", "_event_type", "target_x", "target_y"} & fields
+    assert size < 700
+
+
+def test_freeze_publishes_target_without_telemetry(root):
+    game = _substate(root, GameState)
+    _substate(root, TelemetryState)._apply_clutch(CLUTCH)
+    game.phase = GamePhase.PLAYING
+    root._clean()
+
+    asyncio.run(GameState.event_handlers["trigger_freeze"].fn(game))
+    delta, size = _delta(root)
+
+    assert set(delta) == {GameState.get_full_name(), ResultState.get_full_name()}
+    assert _fields(delta, GameState) == {"phase"}
+    assert _fields(delta, ResultState) == {"target_x", "target_y", "score_slope"}
+    assert size < 400
+
+
+def test_click_sends_provisional_result_then_verification(root):
+    result = _substate(root, ResultState)
+    _substate(root, GameState).phase = GamePhase.VAR_FREEZE
+    root._clean()
+
+    async def click():
+        updates = ResultState.event_handlers["handle_click"].fn(result, {"x": 0.5, "y": 0.5, "accuracy": 100})
+        await updates.__anext__()
+        first = _delta(root)
+        async for _ in updates:
+            pass
+        return first, _delta(root)
+
+    (first, first_size), (second, second_size) = asyncio.run(click())
+
+    assert set(first) == {GameState.get_full_name(), ResultState.get_full_name()}
+    assert _fields(first, ResultState) == {"user_x", "user_y", "accuracy", "score_verified"}
+    assert set(second) == {ResultState.get_full_name()}
+    assert "score_verified" in _fields(second, ResultState)
+    assert first_size < 400 and second_size < 400
+
+
+def _run(handler, state, *args):
+    """Run an event handler to completion; background ones hold no lock on a bare state."""
+    result = handler.fn(state, *args)
+    if hasattr(result, "__anext__"):
+        async def drain():
+            async for _ in result:
+                pass
+        asyncio.run(drain())
+    elif asyncio.iscoroutine(result):
+        result = asyncio.run(result)
+    return result
+
+
+def test_start_var_review_sends_phase_and_clip(root, monkeypatch):
+    from reflex_var.prefetch import clutch_prefetcher
+
+    monkeypatch.setattr(clutch_prefetcher, "pop", lambda session: dict(CLUTCH))
+
+    _run(GameState.event_handlers["start_var_review"], _substate(root, GameState))
+    delta, size = _delta(root)
+
+    assert set(delta) == {GameState.get_full_name(), TelemetryState.get_full_name()}
+    assert _fields(delta, GameState) == {"phase"}
+    fields = _fields(delta, TelemetryState)
+    assert {"player_name", "video_url", "freeze_at"} <= fields
+    assert not {"target_x", "target_y"} & fields
+    assert size < 700
+
+
+def test_prepare_next_clip_sends_only_media(root, monkeypatch):
+    from reflex_var.prefetch import clutch_prefetcher
+
+    monkeypatch.setattr(clutch_prefetcher, "pop", lambda session: dict(CLUTCH))
+
+    _run(GameState.event_handlers["prepare_next_clip"], _substate(root, GameState))
+    delta, size = _delta(root)
+
+    assert set(delta) == {TelemetryState.get_full_name()}
+    assert _fields(delta, TelemetryState) == {"video_url", "still_url", "still_srcset", "still_webp_srcset"}
+    assert size < 300
+
+
+def test_record_first_frame_sends_nothing(root):
+    game = _substate(root, GameState)
+    game.phase = GamePhase.PLAYING
+    root._clean()
+
+    backstop = _run(GameState.event_handlers["record_first_frame"], game, 120.0)
+    delta, size = _delta(root)
+
+    assert backstop is not None
+    assert delta == {}
+    assert size < 10
+
+
+def test_reset_game_sends_phase_and_cleared_result(root):
+    game = _substate(root, GameState)
+    game.phase = GamePhase.RESULT
+    _substate(root, ResultState).accuracy = 87.5
+    root._clean()
+
+    _run(GameState.event_handlers["reset_game"], game)
+    delta, size = _delta(root)
+
+    assert set(delta) == {GameState.get_full_name(), ResultState.get_full_name()}
+    assert _fields(delta, GameState) == {"phase"}
+    assert "accuracy" in _fields(delta, ResultState)
+    assert size < 500
+
+
+def test_submit_score_sends_initials_and_rank(root, database, monkeypatch):
+    from reflex_var.score_writer import score_writer
+
+    queued = []
+    monkeypatch.setattr(score_writer, "submit", queued.append)
+    result = _substate(root, ResultState)
+    result.accuracy, result.score_verified = 91.0, True
+    _substate(root, InputState).user_initials = "ABC"
+    root._clean()
+
+    _run(InputState.event_handlers["submit_score"], _substate(root, InputState), {})
+    delta, size = _delta(root)
+
+    assert len(queued) == 1
+    assert set(delta) == {InputState.get_full_name(), ResultState.get_full_name()}
+    assert _fields(delta, InputState) == {"user_initials"}
+    assert _fields(delta, ResultState) == {"user_rank"}
+    assert size < 300